@@ -18,6 +18,8 @@ from .models.ollama import OllamaModel
 from .models.openai import OpenAIModel
 from .ollama import list_models, pull_model
 from .orchestrator import MultiAgentOrchestrator
+from .generation_cache import default_generation_cache_path
+from .plan_cache import default_plan_cache_path
 from .run_logger import RunLogger, NullRunLogger
 from .settings import settings
 
@@ -201,6 +203,16 @@ def cli_main(ctx: click.Context, backend: str, model: str, ollama_host: str) ->
     type=click.Path(path_type=pathlib.Path),
     help="Directory where generated project files will be created",
 )
+@click.option(
+    "--plan-cache/--no-plan-cache",
+    default=False,
+    help="Reuse lead-planner plans for repeated tasks (stored under ~/.cache/devopsys)",
+)
+@click.option(
+    "--generation-cache/--no-generation-cache",
+    default=False,
+    help="Reuse Python refinements from temperature-0 models (stored under ~/.cache/devopsys)",
+)
 @click.pass_context
 def ask_cmd(
     ctx: click.Context,
@@ -216,6 +228,8 @@ def ask_cmd(
     trace: bool,
     ollama_host_override: str | None,
     project_root: pathlib.Path | None,
+    plan_cache: bool,
+    generation_cache: bool,
 ) -> None:
     """Распознаёт задачу и вызывает нужного агента."""
     text = " ".join(task).strip()
@@ -240,6 +254,7 @@ def ask_cmd(
     model_factory = _make_model_factory(backend_name, selected_model, ollama_host=base_ollama_host)
 
     planner_factory = None
+    planner_model = planner_model or settings.planner_model
     if planner_model:
         planner_factory = _make_model_factory(backend_name, planner_model, ollama_host=base_ollama_host)
 
@@ -253,12 +268,19 @@ def ask_cmd(
         if name not in AGENT_REGISTRY:
             raise click.ClickException(f"Unknown agent in --agent-model: {name}")
         agent_factories[name] = _make_model_factory(backend_name, value.strip(), ollama_host=base_ollama_host)
+    if settings.verifier_model and "verifier" not in agent_factories:
+        agent_factories["verifier"] = _make_model_factory(
+            backend_name, settings.verifier_model, ollama_host=base_ollama_host
+        )
     logger = RunLogger(console) if trace else NullRunLogger()
     orchestrator = MultiAgentOrchestrator(
         model_factory,
         logger=logger,
         planner_model_factory=planner_factory,
         agent_model_factories=agent_factories or None,
+        plan_cache_path=default_plan_cache_path() if plan_cache else None,
+        generation_cache_path=default_generation_cache_path() if generation_cache else None,
+        plan_timeout=settings.plan_timeout or None,
     )
     try:
         result = orchestrator.execute(
@@ -269,6 +291,8 @@ def ask_cmd(
         )
     except RuntimeError as exc:
         raise click.ClickException(str(exc)) from exc
+    finally:
+        orchestrator.close()
 
     for idx, exec_step in enumerate(result.steps, start=1):
         console.print(
@@ -1,13 +1,19 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import List, Mapping, Optional
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 
-from ..langchain_support import model_runnable
+from ..langchain_support import complete_many, model_runnable
 from ..models.base import Model
 
+@lru_cache(maxsize=None)
+def _compile_prompt(template: str) -> tuple[PromptTemplate, tuple[str, ...]]:
+    prompt = PromptTemplate.from_template(template)
+    return prompt, tuple(prompt.input_variables)
+
 @dataclass
 class AgentResult:
     text: str
@@ -24,7 +30,13 @@ class Agent:
     def build_prompt(self) -> PromptTemplate:
         if not self.prompt_template:
             raise NotImplementedError("prompt_template must be defined in subclasses")
-        return PromptTemplate.from_template(self.prompt_template)
+        return _compile_prompt(self.prompt_template)[0]
+
+    def _render_prompt(self, payload: Mapping[str, str]) -> str:
+        if not self.prompt_template:
+            raise NotImplementedError("prompt_template must be defined in subclasses")
+        prompt, names = _compile_prompt(self.prompt_template)
+        return prompt.format(**{name: payload.get(name, "") for name in names})
 
     def postprocess(self, text: str) -> AgentResult:
         return AgentResult(text=text)
@@ -38,15 +50,33 @@ class Agent:
         print(message)
 
     def run(self, task: str, plan_context: str | None = None, workspace: str | None = None) -> AgentResult:
-        prompt = self.build_prompt()
         payload = {
             "task": task.strip(),
             "plan_context": (plan_context or "").strip(),
             "workspace": (workspace or "").strip(),
         }
-        variables = {name: payload.get(name, "") for name in prompt.input_variables}
-        rendered = prompt.format(**variables)
+        rendered = self._render_prompt(payload)
         self._debug_log(f"[agent:{self.name}] prompt:\n{self._snippet(rendered)}\n")
         raw = model_runnable(self.model).invoke(rendered)
         self._debug_log(f"[agent:{self.name}] raw output:\n{self._snippet(raw)}\n")
         return self.postprocess(raw)
+
+    def run_batch(
+        self,
+        task: str,
+        n: int,
+        plan_context: str | None = None,
+        workspace: str | None = None,
+    ) -> List[AgentResult]:
+        """Sample ``n`` answers to one prompt, letting the backend batch them."""
+        payload = {
+            "task": task.strip(),
+            "plan_context": (plan_context or "").strip(),
+            "workspace": (workspace or "").strip(),
+        }
+        rendered = self._render_prompt(payload)
+        self._debug_log(f"[agent:{self.name}] prompt (x{n}):\n{self._snippet(rendered)}\n")
+        raws = complete_many(self.model, rendered, n)
+        for raw in raws:
+            self._debug_log(f"[agent:{self.name}] raw output:\n{self._snippet(raw)}\n")
+        return [self.postprocess(raw) for raw in raws]
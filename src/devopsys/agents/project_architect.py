@@ -64,6 +64,7 @@ Return ONLY JSON with the structure:
       "path": "relative/path.ext",
       "goal": "purpose of the file",
       "agent": "python|bash|docker|universal" (optional),
+      "depends_on": ["relative/path of a file whose contents this file needs"] (optional),
       "requirements": [
         "actionable bullet requirement",
         "..."
@@ -77,12 +78,21 @@ Guidelines:
 - Include README.md with setup (uv venv, uv pip install -e .) and usage instructions.
 - Include pyproject.toml with [project], [project.scripts], and uv-specific metadata where relevant.
 - Ensure every required directory appears via files (use __init__.py to create packages).
-- Only specify files that must exist; omit empty arrays.
+- Only specify files that must exist; omit empty arrays other than depends_on.
+- Give depends_on the files whose names or content a file reuses, or [] when it needs none; [] files are generated in parallel, files without depends_on after all earlier ones.
 - Choose appropriate agent when you know the best specialist; otherwise omit and the orchestrator will auto-select.
 - Requirements must be explicit enough for a single agent to complete without further clarification.
 """
 
 
+def _as_list(value: object) -> list:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value) if isinstance(value, (list, tuple)) else []
+
+
 @dataclass
 class ParsedPlan:
     data: dict
@@ -207,12 +217,17 @@ class ProjectArchitectAgent(Agent):
                 path = (item.get("path") or "").strip()
                 if not path:
                     continue
+                # A missing depends_on stays missing: it means "after every earlier file".
+                depends = item.get("depends_on")
+                if depends is not None:
+                    depends = [str(dep).strip() for dep in _as_list(depends) if str(dep).strip()]
                 normalized_files.append(
                     {
                         "path": path,
                         "goal": (item.get("goal") or "").strip(),
                         "agent": (item.get("agent") or "").strip(),
                         "requirements": [str(req).strip() for req in (item.get("requirements") or []) if str(req).strip()],
+                        "depends_on": depends,
                     }
                 )
             data["files"] = normalized_files
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from .base import Agent, AgentResult
-from .python_utils import normalise_python_output
+from .python_utils import normalise_python_output, python_syntax_error
 
 PROMPT = """
 You are a senior Python engineer working in a multi-agent team.
@@ -31,18 +31,22 @@ class PythonAgent(Agent):
         self._last_task = task
         return super().run(task=task, plan_context=plan_context, workspace="")
 
+    def run_batch(
+        self,
+        task: str,
+        n: int,
+        plan_context: str | None = None,
+        workspace: str | None = None,
+    ) -> list[AgentResult]:
+        self._last_task = task
+        return super().run_batch(task=task, n=n, plan_context=plan_context, workspace="")
+
     def postprocess(self, text: str) -> AgentResult:
         # Pass raw model output to the normaliser which handles Markdown fences,
         # trailing explanations and syntax validation/fixes.
         code = normalise_python_output(text, self._last_task)
         # Decide whether to assign a filename only if code is syntactically valid
-        is_valid = False
-        try:
-            import ast as _ast
-            _ast.parse(code or "")
-            is_valid = True
-        except SyntaxError:
-            is_valid = False
+        is_valid = python_syntax_error(code or "") is None
         if "Generated (dummy backend)" in (code or ""):
             is_valid = True
         filename = "script.py" if is_valid else None
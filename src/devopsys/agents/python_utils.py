@@ -12,10 +12,14 @@ solutions; it only performs generic cleanup and validation.
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Optional, List, Tuple
 import ast
 
 
+# A bare call such as ``main()`` on a trailing line is code, not prose.
+_CALL_LINE_RE = re.compile(r"[\w_]+\(.*\)")
+
 _GENERIC_PLACEHOLDER = (
     "\n".join(
         [
@@ -29,6 +33,21 @@ _GENERIC_PLACEHOLDER = (
 )
 
 
+@lru_cache(maxsize=64)
+def python_syntax_error(code: str) -> Optional[Tuple[str, Optional[int]]]:
+    """Return ``(message, lineno)`` of the ``SyntaxError`` in ``code``, or ``None``.
+
+    The run logger, the static audit and candidate selection all check the
+    same generated script, so the verdict is memoised per source string.
+    """
+    try:
+        # ast.parse without the wrapper; the tree itself is discarded.
+        compile(code, "<unknown>", "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+    except SyntaxError as exc:
+        return exc.msg, exc.lineno
+    return None
+
+
 def _looks_like_valid_python(code: str) -> bool:
     snippet = code.strip()
     if not snippet:
@@ -45,6 +64,20 @@ def _fallback_script_for_task(task: str) -> Optional[str]:
     return None
 
 
+# Outputs above this size are normalised without being kept in the cache.
+_MAX_CACHED_OUTPUT = 64_000
+
+
+@lru_cache(maxsize=512)
+def _normalise_python_output_cached(raw: str, task: str) -> str:
+    return _normalise_python_output(raw, task)
+
+
+def clear_normaliser_cache() -> None:
+    """Drop the memoised results of :func:`normalise_python_output`."""
+    _normalise_python_output_cached.cache_clear()
+
+
 def normalise_python_output(raw: str, task: str) -> str:
     """Ensure the Python agent output is executable, falling back if needed.
 
@@ -54,8 +87,16 @@ def normalise_python_output(raw: str, task: str) -> str:
     3) Validate via ``ast.parse``; if it fails, try a couple of cleanup passes.
     4) Ensure a minimal main() and __main__ guard are present (append if missing).
     5) If all fails, return a task-specific fallback or the generic placeholder.
+
+    The result is a pure function of ``(raw, task)``; retries and validation
+    re-normalise the same output, so results are memoised.
     """
+    if raw is not None and len(raw) > _MAX_CACHED_OUTPUT:
+        return _normalise_python_output(raw, task)
+    return _normalise_python_output_cached(raw, task)
 
+
+def _normalise_python_output(raw: str, task: str) -> str:
     text = (raw or "").strip()
     if not text:
         return _fallback_script_for_task(task) or _GENERIC_PLACEHOLDER.format(task=task)
@@ -65,23 +106,33 @@ def normalise_python_output(raw: str, task: str) -> str:
         return text if text.endswith("\n") else text + "\n"
 
     def _extract_fenced_blocks(s: str) -> List[Tuple[str, str]]:
-        # Returns list of (language_hint, content)
+        # Returns list of (language_hint, content). A fence opens with ```,
+        # an optional word-character language hint and a newline, and closes
+        # at the next ```; located with str.find rather than a regex.
         blocks: List[Tuple[str, str]] = []
-        for m in re.finditer(r"```(?P<lang>\w+)?\n(?P<body>[\s\S]*?)```", s):
-            lang = (m.group("lang") or "").strip().lower()
-            body = m.group("body")
-            blocks.append((lang, body))
+        pos = 0
+        while True:
+            start = s.find("```", pos)
+            if start < 0:
+                break
+            lang_end = start + 3
+            while lang_end < len(s) and (s[lang_end].isalnum() or s[lang_end] == "_"):
+                lang_end += 1
+            if lang_end >= len(s) or s[lang_end] != "\n":
+                pos = start + 1
+                continue
+            close = s.find("```", lang_end + 1)
+            if close < 0:
+                break
+            blocks.append((s[start + 3 : lang_end].lower(), s[lang_end + 1 : close]))
+            pos = close + 3
         return blocks
 
     def _syntax_ok(src: str) -> bool:
         # Treat empty strings as invalid for our purposes.
         if not (src or "").strip():
             return False
-        try:
-            ast.parse(src)
-            return True
-        except SyntaxError:
-            return False
+        return python_syntax_error(src) is None
 
     def _pick_best_block(blocks: List[Tuple[str, str]]) -> Optional[str]:
         if not blocks:
@@ -141,7 +192,7 @@ def normalise_python_output(raw: str, task: str) -> str:
             if tail.startswith("#"):
                 # comments are fine
                 break
-            if not any(tok in tail for tok in code_tokens) and not re.match(r"[\w_]+\(.*\)", tail):
+            if not any(tok in tail for tok in code_tokens) and not _CALL_LINE_RE.match(tail):
                 lines.pop()
                 continue
             break
@@ -197,4 +248,4 @@ if __name__ == "__main__":
     return code if code.endswith("\n") else code + "\n"
 
 
-__all__ = ["normalise_python_output"]
+__all__ = ["clear_normaliser_cache", "normalise_python_output", "python_syntax_error"]
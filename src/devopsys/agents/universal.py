@@ -40,9 +40,7 @@ class UniversalAgent(Agent):
             "project_summary": project_summary.strip(),
             "path": path,
         }
-        prompt = self.build_prompt()
-        variables = {name: payload.get(name, "") for name in prompt.input_variables}
-        rendered = prompt.format(**variables)
+        rendered = self._render_prompt(payload)
         self._debug_log(f"[agent:{self.name}] prompt:\n{self._snippet(rendered)}\n")
         raw = self.model.complete(rendered)
         self._debug_log(f"[agent:{self.name}] raw output:\n{self._snippet(raw)}\n")
@@ -5,6 +5,7 @@ import os
 import re
 import shlex
 import shutil
+import signal
 import subprocess
 import sys
 import tempfile
@@ -14,6 +15,11 @@ from typing import Optional
 
 from .base import Agent, AgentResult
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None  # type: ignore[assignment]
+
 PROMPT = """
 You are a strict code compliance verifier.
 Detected language: {language_name}.
@@ -56,6 +62,97 @@ Rules:
 
 MAX_CAPTURE = 2000
 
+# Tasks mentioning any of these need the script's actual output to be judged,
+# everything else is verified from source after a successful compile.
+_EXEC_REQUIRED_KEYWORDS = (
+    "gpu",
+    "print",
+    "run",
+    "monitor",
+    "check",
+    "status",
+    "usage",
+    "вывед",
+    "вывод",
+    "провер",
+    "запуст",
+    "монитор",
+    "статус",
+)
+
+
+# Caps applied to executed candidates so a runaway script cannot exhaust the host.
+CHILD_MEMORY_LIMIT = 512 << 20
+CHILD_CPU_SECONDS = 4
+CHILD_FILE_SIZE_LIMIT = 1 << 20
+
+
+def _child_limits() -> tuple:
+    if resource is None:  # pragma: no cover - non-POSIX platforms
+        return ()
+    return (
+        (resource.RLIMIT_AS, CHILD_MEMORY_LIMIT),
+        (resource.RLIMIT_CPU, CHILD_CPU_SECONDS),
+        (resource.RLIMIT_FSIZE, CHILD_FILE_SIZE_LIMIT),
+    )
+
+
+# The limits are set by a tiny interpreter that then execs the real command,
+# so the target starts already capped and nothing runs between fork and exec.
+_LIMIT_SHIM = """
+import os, resource, sys
+for kind, value in {limits!r}:
+    try:
+        resource.setrlimit(kind, (value, value))
+    except (ValueError, OSError):
+        pass
+os.execvp(sys.argv[1], sys.argv[1:])
+"""
+
+
+def _run_isolated(
+    command: list[str],
+    *,
+    timeout: float,
+    cwd: str | Path | None = None,
+    env: dict[str, str] | None = None,
+    limit_resources: bool = True,
+) -> subprocess.CompletedProcess:
+    """Run generated code in its own session and kill the whole group on timeout.
+
+    ``subprocess.run`` only kills the direct child, so scripts that fork
+    helpers could outlive the verifier. Re-raises ``TimeoutExpired`` after
+    cleanup to keep the ``subprocess.run`` contract. Unless disabled, the child
+    also gets memory, CPU time and file size limits. No ``preexec_fn`` is used:
+    the model loop and step pools keep other threads alive, which makes
+    running Python between fork and exec unsafe.
+    """
+    argv = command
+    if limit_resources and resource is not None:
+        argv = [sys.executable, "-c", _LIMIT_SHIM.format(limits=_child_limits()), *command]
+    proc = subprocess.Popen(  # nosec B603 B607 - intentional execution for verification
+        argv,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        cwd=cwd,
+        env=env,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:  # pragma: no cover - non-POSIX platforms
+            proc.kill()
+        proc.communicate()
+        raise
+    return subprocess.CompletedProcess(command, proc.returncode, stdout, stderr)
+
 
 @dataclass
 class ExecutionReport:
@@ -67,6 +164,8 @@ class ExecutionReport:
     stderr: str
     returncode: Optional[int]
     invocation: Optional[str]
+    # Compiled but deliberately not run: the task needs no runtime output.
+    runtime_skipped: bool = False
 
 
 class VerifierAgent(Agent):
@@ -99,7 +198,6 @@ class VerifierAgent(Agent):
             project_meta=project_meta,
         )
         analysis = self._format_analysis(report, filename)
-        prompt = self.build_prompt()
         payload = {
             "task": task.strip(),
             "code": code.strip(),
@@ -109,8 +207,7 @@ class VerifierAgent(Agent):
             "language_name": report.language or "unknown",
             "language_fence": self._language_fence(report.language),
         }
-        variables = {name: payload.get(name, "") for name in prompt.input_variables}
-        rendered = prompt.format(**variables)
+        rendered = self._render_prompt(payload)
         self._debug_log(f"[agent:{self.name}] prompt:\n{self._snippet(rendered)}\n")
         raw = self.model.complete(rendered)
         self._debug_log(f"[agent:{self.name}] raw output:\n{self._snippet(raw)}\n")
@@ -135,7 +232,7 @@ class VerifierAgent(Agent):
 
         language = self._detect_language(task, code, filename)
         if language == "python":
-            return self._execute_python(code, mode, filename)
+            return self._execute_python(code, mode, filename, task=task)
         if language == "bash":
             return self._execute_bash(code, mode, filename)
         if language == "dockerfile":
@@ -188,7 +285,14 @@ class VerifierAgent(Agent):
             return "bash"
         return "unknown"
 
-    def _execute_python(self, code: str, mode: str, filename: str | None) -> ExecutionReport:
+    def _execute_python(
+        self,
+        code: str,
+        mode: str,
+        filename: str | None,
+        *,
+        task: str = "",
+    ) -> ExecutionReport:
         try:
             compile(code, filename or "<script>", "exec")
             compilation_ok = True
@@ -202,6 +306,7 @@ class VerifierAgent(Agent):
         stderr = ""
         returncode: Optional[int] = None
         invocation = None
+        runtime_skipped = False
 
         if compilation_ok and mode == "syntax":
             ruff_path = shutil.which("ruff")
@@ -240,20 +345,17 @@ class VerifierAgent(Agent):
                         compilation_ok = False
                         compilation_error = stderr
 
-        if compilation_ok and mode != "syntax":
+        if compilation_ok and mode != "syntax" and not self._requires_execution(task):
+            # Nothing in the task depends on runtime output; judge the source alone.
+            runtime_skipped = True
+        elif compilation_ok and mode != "syntax":
             with tempfile.TemporaryDirectory() as tmpdir:
                 script_path = Path(tmpdir) / "script.py"
                 script_path.write_text(code, encoding="utf-8")
                 command = [sys.executable or "python", str(script_path)]
                 invocation = " ".join(shlex.quote(part) for part in command)
                 try:
-                    completed = subprocess.run(  # nosec B603 B607 - intentional execution for verification
-                        command,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        timeout=10,
-                    )
+                    completed = _run_isolated(command, timeout=10)
                     stdout = completed.stdout.strip()[:MAX_CAPTURE]
                     stderr = completed.stderr.strip()[:MAX_CAPTURE]
                     returncode = completed.returncode
@@ -271,8 +373,14 @@ class VerifierAgent(Agent):
             stderr=stderr,
             returncode=returncode,
             invocation=invocation,
+            runtime_skipped=runtime_skipped,
         )
 
+    @staticmethod
+    def _requires_execution(task: str) -> bool:
+        task_lc = (task or "").lower()
+        return any(keyword in task_lc for keyword in _EXEC_REQUIRED_KEYWORDS)
+
     def _execute_bash(self, code: str, mode: str, filename: str | None) -> ExecutionReport:
         stdout = ""
         stderr = ""
@@ -313,11 +421,8 @@ class VerifierAgent(Agent):
                     command.append(str(sample_dir))
                 invocation = " ".join(shlex.quote(part) for part in command)
                 try:
-                    completed = subprocess.run(  # nosec B603 B607 - intentional execution for verification
+                    completed = _run_isolated(
                         command,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
                         timeout=10,
                         cwd=tmpdir,
                         env={**os.environ, "LC_ALL": "C"},
@@ -450,14 +555,13 @@ class VerifierAgent(Agent):
             command.append("--help")
         invocation = " ".join(shlex.quote(part) for part in command)
         try:
-            completed = subprocess.run(  # nosec B603 B607 - intentional project execution
+            completed = _run_isolated(
                 command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
                 timeout=45,
                 cwd=root,
                 env={**os.environ, "CI": "1", "UV_NO_COMPILE_BYTECODE": "1"},
+                # uv resolves and installs dependencies here; the caps would break it.
+                limit_resources=False,
             )
             stdout = completed.stdout.strip()[:MAX_CAPTURE]
             stderr = completed.stderr.strip()[:MAX_CAPTURE]
@@ -509,6 +613,8 @@ class VerifierAgent(Agent):
             details.append(f"syntax=fail:{report.compilation_error}")
         if report.invocation:
             details.append(f"command={report.invocation}")
+        if report.runtime_skipped:
+            details.append("runtime=skipped")
         if report.returncode is not None:
             details.append(f"exit_code={report.returncode}")
         return "; ".join(filter(None, details))
@@ -578,7 +684,12 @@ class VerifierAgent(Agent):
             _append_reason(report.compilation_error or "failed static analysis")
             _add_missing(f"return syntactically valid {lang_label}")
 
-        if report.compilation_ok and language in {"python", "bash"} and report.mode != "syntax":
+        if (
+            report.compilation_ok
+            and language in {"python", "bash"}
+            and report.mode != "syntax"
+            and not report.runtime_skipped
+        ):
             if report.returncode is None:
                 ok = False
                 _append_reason("script did not complete execution")
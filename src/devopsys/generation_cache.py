@@ -0,0 +1,89 @@
+"""Exact-match cache for deterministic agent generations.
+
+With temperature 0 a backend answers the same prompt with the same text, so a
+refinement instruction that was already generated for the same workspace and
+model can be served again without another LLM call. Keys combine the agent
+name, the model identity, the instruction and the workspace context.
+Entries live in memory; pass ``path`` to also persist them in SQLite.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+from . import jsonutil
+from .agents.base import AgentResult
+from .models.base import Model
+from .sqlite_cache import SQLiteLRUCache, default_cache_dir
+
+_Entry = Tuple[str, Optional[str]]
+
+
+def default_generation_cache_path() -> Path:
+    return default_cache_dir() / "gen.sqlite"
+
+
+def model_identity(model: Model) -> str:
+    return f"{type(model).__name__}:{getattr(model, 'model', '')}"
+
+
+def is_deterministic(model: Model) -> bool:
+    """True when ``model`` samples greedily, so equal prompts give equal text."""
+    return getattr(model, "temperature", None) == 0
+
+
+def generation_cache_key(agent: str, model: Model, instruction: str, workspace: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (agent, model_identity(model), instruction, workspace):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _encode_entry(entry: _Entry) -> str:
+    return jsonutil.dumps(list(entry))
+
+
+def _decode_entry(text: str) -> Optional[_Entry]:
+    try:
+        data = jsonutil.loads(text)
+    except jsonutil.JSONDecodeError:
+        return None
+    if not (isinstance(data, list) and len(data) == 2 and isinstance(data[0], str)):
+        return None
+    return data[0], data[1] if isinstance(data[1], str) else None
+
+
+class GenerationCache:
+    """Map from generation key to the ``AgentResult`` it produced."""
+
+    def __init__(self, max_entries: int = 256, path: str | Path | None = None) -> None:
+        self._store: SQLiteLRUCache[_Entry] = SQLiteLRUCache(
+            max_entries, path, encode=_encode_entry, decode=_decode_entry
+        )
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, key: str) -> Optional[AgentResult]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        return AgentResult(text=entry[0], filename=entry[1])
+
+    def put(self, key: str, result: AgentResult) -> None:
+        self._store.put(key, (result.text, result.filename))
+
+    def close(self) -> None:
+        self._store.close()
+
+
+__all__ = [
+    "GenerationCache",
+    "default_generation_cache_path",
+    "generation_cache_key",
+    "is_deterministic",
+    "model_identity",
+]
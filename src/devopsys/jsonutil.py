@@ -0,0 +1,91 @@
+"""JSON helpers that use ``orjson`` when it is installed.
+
+``orjson`` is an optional speed-up (``pip install devopsys[speed]``); the
+stdlib ``json`` module is used otherwise. ``orjson.JSONDecodeError`` derives
+from ``json.JSONDecodeError``, so callers catch the stdlib exception in
+both cases.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional, Union
+
+try:  # pragma: no cover - exercised only when orjson is installed
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Parse a JSON document from text or raw bytes."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialise ``obj`` to compact UTF-8 JSON text (non-ASCII kept as is)."""
+    if _orjson is not None:
+        return _orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+class ObjectScanner:
+    """Incrementally detect where the first top-level ``{...}`` object ends.
+
+    Feed text chunks as they arrive; ``feed`` returns ``True`` once the braces
+    of the first object balance. Braces inside JSON strings are ignored.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.started = False
+        self.complete = False
+        # Characters consumed so far; once complete, the object ends here.
+        self.consumed = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        if self.complete:
+            return True
+        for offset, char in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self.started
+            elif char == "{":
+                self.depth += 1
+                self.started = True
+            elif char == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    self.consumed += offset + 1
+                    return True
+        self.consumed += len(chunk)
+        return False
+
+
+def first_object(text: str) -> Optional[str]:
+    """Return the first balanced top-level ``{...}`` in ``text``, if any."""
+    start = text.find("{")
+    if start == -1:
+        return None
+    scanner = ObjectScanner()
+    if not scanner.feed(text[start:]):
+        return None
+    return text[start : start + scanner.consumed]
+
+
+__all__ = ["JSONDecodeError", "ObjectScanner", "dumps", "first_object", "loads"]
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Callable, cast
+import asyncio
+from typing import Any, Callable, Optional, cast
 
 from langchain_core.runnables import RunnableLambda
 import httpx
 
-from .models.base import Model
+from .jsonutil import ObjectScanner
+from .models.base import Model, run_sync
 
 
 def _format_http_error(exc: httpx.HTTPStatusError, model: Model) -> RuntimeError:
@@ -47,3 +49,39 @@ def model_runnable(model: Model) -> RunnableLambda:
 
     # cast keeps type checkers calm; LangChain accepts callables returning strings.
     return RunnableLambda(cast(Callable[[Any], str], _invoke), afunc=_ainvoke)
+
+
+def complete_json_object(model: Model, prompt: str, timeout: Optional[float] = None) -> str:
+    """Stream a completion and stop reading once its first JSON object closes.
+
+    Trailing prose after the object is never generated to completion, which
+    saves decode time on chatty models; the accumulated text is returned.
+    With ``timeout`` (seconds) the stream is cancelled and ``TimeoutError``
+    raised once it runs over.
+    """
+
+    async def _collect() -> str:
+        scanner = ObjectScanner()
+        parts: list[str] = []
+        stream = model.astream(prompt)
+        try:
+            async for piece in stream:
+                parts.append(piece)
+                if scanner.feed(piece):
+                    break
+        finally:
+            await stream.aclose()
+        return "".join(parts)
+
+    try:
+        return run_sync(asyncio.wait_for(_collect(), timeout))
+    except httpx.HTTPStatusError as exc:  # pragma: no cover - network dependent
+        raise _format_http_error(exc, model) from exc
+
+
+def complete_many(model: Model, prompt: str, n: int) -> list[str]:
+    """Request ``n`` completions of one prompt in a single batched call."""
+    try:
+        return run_sync(model.acomplete_many(prompt, n))
+    except httpx.HTTPStatusError as exc:  # pragma: no cover - network dependent
+        raise _format_http_error(exc, model) from exc
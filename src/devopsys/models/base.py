@@ -1,6 +1,53 @@
 from __future__ import annotations
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncIterator, Awaitable, Iterable, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+
+class ModelError(RuntimeError):
+    """The backend accepted the request but reported a failure in its reply."""
+
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop shared by synchronous model calls.
+
+    The loop runs forever on a daemon thread, so clients bound to it (see
+    ``HTTPModel``) stay usable from one ``complete`` call to the next.
+    """
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP_THREAD is None or not _LOOP_THREAD.is_alive():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="devopsys-models", daemon=True)
+            thread.start()
+            _LOOP, _LOOP_THREAD = loop, thread
+        return _LOOP
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """Run ``awaitable`` to completion from synchronous code."""
+    if threading.current_thread() is _LOOP_THREAD:
+        # Blocking the shared loop on itself would deadlock.
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise RuntimeError("run_sync called from the model event loop thread")
+    future = asyncio.run_coroutine_threadsafe(_as_coroutine(awaitable), _background_loop())
+    return future.result()
+
+
+async def _as_coroutine(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
 
 class Model(ABC):
     """Абстракция LLM-бэкенда."""
@@ -8,10 +55,68 @@ class Model(ABC):
     async def acomplete(self, prompt: str) -> str:
         ...
 
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield the completion in pieces; backends without streaming yield it whole."""
+        yield await self.acomplete(prompt)
+
+    async def acomplete_many(self, prompt: str, n: int) -> list[str]:
+        """Return ``n`` independent completions; backends may batch them."""
+        return list(await asyncio.gather(*(self.acomplete(prompt) for _ in range(n))))
+
     def complete(self, prompt: str) -> str:
-        import anyio
-        return anyio.run(self.acomplete, prompt)
+        return run_sync(self.acomplete(prompt))
+
+    async def aclose(self) -> None:
+        """Release backend resources; a no-op for models without any."""
+        return None
+
+    def close(self) -> None:
+        run_sync(self.aclose())
 
     @staticmethod
     def join_messages(parts: Iterable[str]) -> str:
         return "\n\n".join(p.strip() for p in parts if p and p.strip())
+
+
+class HTTPModel(Model):
+    """Model talking to an HTTP API through one reusable ``httpx.AsyncClient``.
+
+    The client is bound to the event loop it was created on, so it is rebuilt
+    whenever ``acomplete`` runs on a different loop; the replaced client is
+    closed on its own loop if that loop is still open. Synchronous
+    ``complete`` calls all share one background loop and therefore one
+    connection pool.
+    """
+
+    timeout: float = 120.0
+    limits = httpx.Limits(max_keepalive_connections=8, max_connections=16)
+    _client: Optional[httpx.AsyncClient] = None
+    _client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is None or client.is_closed or self._client_loop is not loop:
+            if client is not None and not client.is_closed:
+                _close_on_loop(client, self._client_loop)
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._client = client
+            self._client_loop = loop
+        return client
+
+    async def aclose(self) -> None:
+        client, loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        # A client from a loop that has since finished cannot be closed cleanly;
+        # its connections died with that loop, so just drop the reference.
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+
+
+def _close_on_loop(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    # The client's connections belong to ``loop``, so its close has to run
+    # there; a closed loop already took them down with it.
+    if loop is None or loop.is_closed():
+        return
+    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
@@ -1,8 +1,10 @@
 from __future__ import annotations
-import httpx
-from .base import Model
+from typing import AsyncIterator
 
-class OllamaModel(Model):
+from .. import jsonutil
+from .base import HTTPModel, ModelError
+
+class OllamaModel(HTTPModel):
     def __init__(
         self,
         host: str,
@@ -17,7 +19,8 @@ class OllamaModel(Model):
         self.max_tokens = max_tokens
         self.timeout = timeout
 
-    async def acomplete(self, prompt: str) -> str:
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield response fragments as Ollama generates them."""
         payload = {
             "model": self.model,
             "prompt": prompt,
@@ -25,10 +28,28 @@ class OllamaModel(Model):
                 "temperature": self.temperature,
                 "num_predict": self.max_tokens,
             },
-            "stream": False,
+            "stream": True,
         }
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(f"{self.host}/api/generate", json=payload)
+        client = self._get_client()
+        async with client.stream("POST", f"{self.host}/api/generate", json=payload) as r:
             r.raise_for_status()
-            data = r.json()
-            return data.get("response", "")
+            async for line in r.aiter_lines():
+                if not line:
+                    continue
+                try:
+                    chunk = jsonutil.loads(line)
+                except jsonutil.JSONDecodeError:
+                    raise ModelError(f"Ollama sent a malformed stream line: {line[:200]!r}") from None
+                # Failures after the 200 status (e.g. out of memory mid-generation)
+                # arrive as an "error" line; a silent stop would truncate the text.
+                if chunk.get("error"):
+                    raise ModelError(f"Ollama error: {chunk['error']}")
+                piece = chunk.get("response")
+                if piece:
+                    yield piece
+                if chunk.get("done"):
+                    break
+
+    async def acomplete(self, prompt: str) -> str:
+        parts = [piece async for piece in self.astream(prompt)]
+        return "".join(parts)
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-import httpx
+from .base import HTTPModel
 
-from .base import Model
 
-
-class OpenAIModel(Model):
+class OpenAIModel(HTTPModel):
     def __init__(
         self,
         api_key: str | None,
@@ -26,7 +24,7 @@ class OpenAIModel(Model):
         self.timeout = timeout
         self.system_prompt = system_prompt or "You are a helpful coding assistant."
 
-    async def acomplete(self, prompt: str) -> str:
+    async def _chat(self, prompt: str, n: int = 1) -> list[str]:
         headers = {"Content-Type": "application/json"}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
@@ -39,12 +37,27 @@ class OpenAIModel(Model):
                 {"role": "user", "content": prompt},
             ],
         }
+        if n > 1:
+            payload["n"] = n
         url = f"{self.base_url}/chat/completions"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.post(url, json=payload, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
+        client = self._get_client()
+        resp = await client.post(url, json=payload, headers=headers)
+        resp.raise_for_status()
+        data = resp.json()
         try:
-            return data["choices"][0]["message"]["content"].strip()
-        except (KeyError, IndexError, TypeError):  # pragma: no cover - defensive
-            return ""
+            return [choice["message"]["content"].strip() for choice in data["choices"]][:n]
+        except (KeyError, TypeError, AttributeError):  # pragma: no cover - defensive
+            return []
+
+    async def acomplete(self, prompt: str) -> str:
+        choices = await self._chat(prompt)
+        return choices[0] if choices else ""
+
+    async def acomplete_many(self, prompt: str, n: int) -> list[str]:
+        # One request with ``n`` shares the prompt prefix server-side. Some
+        # OpenAI-compatible servers ignore ``n``; top up with single calls.
+        choices = await self._chat(prompt, n) if n > 1 else []
+        missing = n - len(choices)
+        if missing > 0:
+            choices.extend(await super().acomplete_many(prompt, missing))
+        return choices
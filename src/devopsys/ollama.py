@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from typing import Iterable, List, Optional, Tuple
 
 import httpx
 from rich.console import Console
 
+from . import jsonutil
+
 
 @dataclass
 class PullEvent:
@@ -31,8 +32,8 @@ def _parse_events(lines: Iterable[str]) -> Iterable[PullEvent]:
         if not raw:
             continue
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+            data = jsonutil.loads(raw)
+        except jsonutil.JSONDecodeError:
             continue
         status = data.get("status")
         if not status:
@@ -75,7 +76,7 @@ def list_models(host: str, timeout: float = 30.0) -> List[ModelInfo]:
         response = client.get(url)
         response.raise_for_status()
 
-    payload = response.json()
+    payload = jsonutil.loads(response.content)
     items = payload.get("models", []) if isinstance(payload, dict) else []
 
     models: List[ModelInfo] = []
@@ -1,25 +1,35 @@
 from __future__ import annotations
 
 import json
-import re
 import itertools
+import logging
+import os
+import re
 import shutil
 import subprocess
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Iterable, List, Sequence, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Optional, Tuple
 
 import tomllib
 
+import httpx
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 
+from . import jsonutil
 from .agents.base import Agent, AgentResult
+from .agents.python_utils import python_syntax_error
 from .agents.registry import AGENT_REGISTRY
-from .langchain_support import model_runnable
-from .models.base import Model
+from .langchain_support import complete_json_object, model_runnable
+from .models.base import Model, ModelError
 from .models.dummy import DummyModel
-from .router import Router
+from .generation_cache import GenerationCache, generation_cache_key, is_deterministic, model_identity
+from .plan_cache import PlanCache
+from .router import Route, classify as classify_route
 from .workspace import build_workspace_snapshot
 from .run_logger import NullRunLogger
 from .project_builder import (
@@ -32,80 +42,274 @@ from .project_builder import (
     summarize_created_files,
 )
 
+_log = logging.getLogger(__name__)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanStep:
     agent: str
     instruction: str
     reason: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StepExecution:
     step: PlanStep
     result: AgentResult
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class TaskContext:
+    """Facts about the current task derived once per ``execute`` call."""
+
+    task_lc: str
+    route: Optional[Route] = None
+
+    @classmethod
+    def build(cls, task: str, route: Optional[Route] = None) -> "TaskContext":
+        return cls(task_lc=(task or "").lower(), route=route)
+
+
+@dataclass(slots=True, frozen=True)
 class OrchestrationResult:
     final: AgentResult
     steps: Sequence[StepExecution]
 
 
+# Static instructions come first and volatile context last, so consecutive
+# plan prompts share the longest possible prefix for provider-side prompt
+# caching (OpenAI) and KV-cache reuse (Ollama).
 PLAN_PROMPT = """
 You are the lead planner in a LangChain multi-agent DevOps system.
-Available specialized agents: {agent_names}.
 Analyse the user request and break it down into an ordered plan with the minimum number of steps.
 Only include an agent if its contribution is essential for the final result. Prefer a single specialist when possible.
 Each plan step must be a JSON object with fields: agent, instruction, reason.
 Use only the allowed agent names.
 
-Workspace snapshot (read-only context):
-{workspace}
-
 Return a JSON object with the exact shape:
 {{"plan": [{{"agent": "name", "instruction": "...", "reason": "..."}}, ...]}}
 
+Available specialized agents: {agent_names}.
+
+Workspace snapshot (read-only context):
+{workspace}
+
 User request:
 {task}
 """
 
 
-def _fallback_plan(task: str) -> List[PlanStep]:
-    route = Router().classify(task)
+REVIEW_PROMPT = (
+    "You are a strict code reviewer. Assess if the Python script fulfills the task.\n"
+    "Return ONLY JSON with keys \"ok\" (boolean), \"reason\" (string), and \"missing\" (array of strings).\n"
+    "Example: {{\"ok\": false, \"reason\": \"does not draw ASCII square\", \"missing\": [\"render square\"]}}\n"
+    "Set ok=true only if the script directly implements the task without unrelated features or external calls.\n\n"
+    "Task:\n{task}\n\n"
+    "Script:\n```python\n{code}\n```\n"
+)
+
+# Parsed once at import; formatting a PromptTemplate never mutates it.
+_PLAN_TEMPLATE = PromptTemplate.from_template(PLAN_PROMPT)
+_REVIEW_TEMPLATE = PromptTemplate.from_template(REVIEW_PROMPT)
+
+_PROJECT_HINTS = (
+    "project",
+    "проект",
+    "pyproject",
+    "readme",
+    "package",
+    "init.py",
+    "src/",
+    "структур",
+    "каталог",
+    "module",
+)
+_GPU_KEYWORDS = ("gpu", "nvidia-smi", "cuda")
+_DIR_KEYWORDS = ("directory", "directories", "folder", "folders")
+_GPU_REFINEMENT_HINT = (
+    "When gathering GPU utilisation, call subprocess.run("
+    "['nvidia-smi', '--query-gpu=utilization.gpu', "
+    "'--format=csv,noheader,nounits'], capture_output=True, text=True, check=False) without shell=True. "
+    "Gracefully handle FileNotFoundError or non-zero return codes by printing a clear message "
+    "and exiting cleanly (use sys.exit(0) after the message). "
+    "Provide one line per GPU with its utilisation or an informative fallback when data is unavailable."
+)
+_DIRECTORY_REFINEMENT_HINT = (
+    "List directories via os.scandir(path) filtered with entry.is_dir(). "
+    "Expose an argparse --path argument defaulting to '.', sort the resulting folder names, "
+    "and print them one per line."
+)
+_PROJECT_HINT_RE = re.compile("|".join(map(re.escape, _PROJECT_HINTS)), re.IGNORECASE)
+
+
+def _json_object_candidate(text: str) -> str:
+    """Return the first balanced ``{...}`` object in ``text``.
+
+    Falls back to the first-``{``-to-last-``}`` slice when braces never
+    balance, and to the text itself when it has no object at all.
+    """
+    balanced = jsonutil.first_object(text)
+    if balanced is not None:
+        return balanced
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        return text
+    return text[start : end + 1]
+
+
+def _completed_future(fn: Callable[..., Any], **kwargs: Any) -> Future:
+    """Run ``fn`` now and wrap its outcome in an already-resolved future."""
+    future: Future = Future()
+    try:
+        future.set_result(fn(**kwargs))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+class _DeferredFuture(Future):
+    """Future that runs ``fn`` in the caller's thread on the first ``result()``.
+
+    The sequential path of ``_start_agent_runs`` uses it so each step still
+    starts only when its turn comes: after the previous step was logged and
+    never at all once an earlier step failed and the rest were cancelled.
+    """
+
+    def __init__(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def _run(self) -> None:
+        if self.done() or not self.set_running_or_notify_cancel():
+            return
+        try:
+            self.set_result(self._fn(*self._args, **self._kwargs))
+        except Exception as exc:
+            self.set_exception(exc)
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        self._run()
+        return super().result(timeout)
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        self._run()
+        return super().exception(timeout)
+
+
+@lru_cache(maxsize=32)
+def _load_pyproject(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse ``pyproject.toml`` at ``path``; ``mtime_ns`` and ``size`` key the cache.
+
+    The result is shared between callers and must be treated as read-only.
+    """
+    return tomllib.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def _robust_json_loads(raw: str | None) -> Any:
+    """Parse the JSON payload of an LLM reply, loosening step by step.
+
+    Tries the reply as-is, then without a surrounding Markdown fence, then the
+    outermost ``{...}`` slice, and finally that slice with control characters
+    allowed inside strings. Returns ``None`` when nothing parses.
+    """
+    text = (raw or "").strip()
+    if not text:
+        return None
+    try:
+        return jsonutil.loads(text)
+    except jsonutil.JSONDecodeError:
+        pass
+    if text.startswith("```"):
+        _, _, body = text.partition("\n")
+        body = body.rstrip()
+        if body.endswith("```"):
+            body = body[:-3]
+        text = body.strip()
+        try:
+            return jsonutil.loads(text)
+        except jsonutil.JSONDecodeError:
+            pass
+    candidate = _json_object_candidate(text)
+    if candidate != text:
+        try:
+            return jsonutil.loads(candidate)
+        except jsonutil.JSONDecodeError:
+            pass
+    try:
+        return json.loads(candidate, strict=False)
+    except json.JSONDecodeError:
+        return None
+
+
+def _fallback_plan(task: str, route: Optional[Route] = None) -> List[PlanStep]:
+    route = route or classify_route(task)
     return [PlanStep(agent=route.agent, instruction=task, reason=route.reason)]
 
 
 class LeadAgent:
-    def __init__(self, model: Model) -> None:
+    def __init__(
+        self,
+        model: Model,
+        cache: Optional[PlanCache] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
         self.model = model
-        self.prompt = PromptTemplate.from_template(PLAN_PROMPT)
-        self.chain = self.prompt | model_runnable(model) | StrOutputParser()
-
-    def plan(self, task: str, workspace: str) -> List[PlanStep]:
+        self.cache = cache
+        # Seconds to wait for the model before settling for the router's plan.
+        self.timeout = timeout
+        self.agent_names = ", ".join(sorted(AGENT_REGISTRY))
+        self.prompt = _PLAN_TEMPLATE
+        # True when the last plan() came from the model (or its cached answer)
+        # rather than the router fallback; only such plans are worth caching.
+        self.planned_by_model = False
+
+    def plan(self, task: str, workspace: str, route: Optional[Route] = None) -> List[PlanStep]:
+        """Ask the model for a plan; the fallback reuses ``route`` when given."""
+        self.planned_by_model = False
         if isinstance(self.model, DummyModel):
-            return _fallback_plan(task)
-
-        raw = self.chain.invoke(
-            {
-                "agent_names": ", ".join(sorted(AGENT_REGISTRY.keys())),
-                "task": task.strip(),
-                "workspace": workspace,
-            }
+            return _fallback_plan(task, route)
+
+        if self.cache is not None:
+            cached = self.cache.get(task, workspace, model_identity(self.model))
+            if cached:
+                try:
+                    steps = [PlanStep(**item) for item in cached if item.get("agent") in AGENT_REGISTRY]
+                except (TypeError, KeyError):
+                    # Written by another version or edited by hand; ask the model.
+                    steps = []
+                if steps:
+                    self.planned_by_model = True
+                    return steps
+
+        prompt = self.prompt.format(
+            agent_names=self.agent_names,
+            task=task.strip(),
+            workspace=workspace,
         )
+        try:
+            raw = complete_json_object(self.model, prompt, timeout=self.timeout)
+        except (TimeoutError, httpx.HTTPError, ModelError) as exc:
+            # A hung, unreachable or failing planner must not hold up the run;
+            # the router's single-step plan is what a parse failure yields too.
+            if isinstance(exc, TimeoutError):
+                cause = f"did not answer within {self.timeout}s"
+            else:
+                cause = f"failed ({exc!r})"
+            _log.warning("Planner %s; using the keyword router's plan instead.", cause)
+            return _fallback_plan(task, route)
         steps = self._parse_plan(raw)
         if not steps:
-            return _fallback_plan(task)
+            return _fallback_plan(task, route)
+        self.planned_by_model = True
         return steps
 
     @staticmethod
     def _parse_plan(raw: str) -> List[PlanStep]:
-        text = raw.strip()
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        candidate = match.group(0) if match else text
-        try:
-            data = json.loads(candidate)
-        except json.JSONDecodeError:
+        data = _robust_json_loads(raw)
+        if data is None:
             return []
         plan_items = data.get("plan") if isinstance(data, dict) else data
         result: List[PlanStep] = []
@@ -136,12 +340,34 @@ class MultiAgentOrchestrator:
         *,
         planner_model_factory: Optional[Callable[[], Model]] = None,
         agent_model_factories: Optional[dict[str, Callable[[], Model]]] = None,
+        plan_cache_enabled: bool = False,
+        plan_cache_path: str | Path | None = None,
+        generation_cache_enabled: bool = False,
+        generation_cache_path: str | Path | None = None,
+        plan_timeout: Optional[float] = None,
+        max_parallel_steps: int = 4,
+        refinement_candidates: int = 1,
     ) -> None:
         # Default model used when no per-role override is provided
         self.model_factory = default_model_factory
         self.planner_model_factory = planner_model_factory
         self.agent_model_factories = agent_model_factories or {}
         self.logger = logger or NullRunLogger()
+        self.plan_cache: Optional[PlanCache] = None
+        if plan_cache_enabled or plan_cache_path is not None:
+            self.plan_cache = PlanCache(path=plan_cache_path)
+        self.generation_cache: Optional[GenerationCache] = None
+        if generation_cache_enabled or generation_cache_path is not None:
+            self.generation_cache = GenerationCache(path=generation_cache_path)
+        self.plan_timeout = plan_timeout
+        self.max_parallel_steps = max_parallel_steps
+        self.refinement_candidates = refinement_candidates
+        # One model per distinct factory, built on first use and shared by every
+        # role and step that resolves to it (see _get_model). Factories may be
+        # called only once per orchestrator, so they must not carry per-step
+        # side effects; pass a fresh orchestrator to rebuild models.
+        self._models: dict[Callable[[], Model], Model] = {}
+        self._reviewer_chain = None
 
     def execute(
         self,
@@ -150,8 +376,8 @@ class MultiAgentOrchestrator:
         os_name: str | None = None,
         project_root: str | Path | None = None,
     ) -> OrchestrationResult:
-        planner_model = (self.planner_model_factory or self.model_factory)()
-        planner = LeadAgent(planner_model)
+        planner_model = self._get_model("planner")
+        planner = LeadAgent(planner_model, cache=self.plan_cache, timeout=self.plan_timeout)
         workspace_snapshot = build_workspace_snapshot()
         self.logger.on_start(task, workspace_snapshot)
 
@@ -159,36 +385,46 @@ class MultiAgentOrchestrator:
         if project_root is not None:
             base_project_root = Path(project_root).expanduser().resolve()
 
+        context = TaskContext.build(task, route=None if forced_agent else classify_route(task))
+        planned: List[PlanStep] = []
         if forced_agent:
             plan = [PlanStep(agent=forced_agent, instruction=task, reason="forced by user")]
         else:
-            plan = planner.plan(task, workspace_snapshot)
-            plan = self._prune_plan(plan, task)
+            # The cache keeps the planner's own answer; pruning is re-applied
+            # on every run, so cached plans follow changes to the rules.
+            planned = planner.plan(task, workspace_snapshot, route=context.route)
+            plan = self._prune_plan(planned, task, route=context.route)
             plan = self._ensure_project_plan(task, plan)
 
         if not plan:
-            plan = _fallback_plan(task)
+            plan = _fallback_plan(task, context.route)
 
         self.logger.on_plan(plan)
 
-        executions: List[StepExecution] = []
-        project_summary: AgentResult | None = None
+        prepared: List[Tuple[PlanStep, Agent, Model, str]] = []
         for step in plan:
             agent_cls = AGENT_REGISTRY.get(step.agent)
             if agent_cls is None:
                 continue
-            factory = self.agent_model_factories.get(step.agent, self.model_factory)
-            agent_model = factory()
-            agent = agent_cls(agent_model)
+            agent_model = self._get_model(step.agent)
             instruction = step.instruction or task
             if step.agent == "linux" and os_name:
                 instruction = f"[target distro: {os_name}]\n{instruction}"
-            self.logger.on_agent_start(step, instruction, step.reason)
-            try:
-                result = agent.run(task=instruction, plan_context=step.reason, workspace=workspace_snapshot)
-            except Exception as exc:  # pragma: no cover - bubble up after logging
-                self.logger.on_agent_error(step, exc)
-                raise
+            prepared.append((step, agent_cls(agent_model), agent_model, instruction))
+
+        # Plan steps only see the task, their reason and the workspace snapshot,
+        # never each other's output, so their LLM calls can overlap. Results are
+        # still consumed (logged, verified, refined) strictly in plan order.
+        pending = self._start_agent_runs(
+            [(step, agent, instruction, step.reason) for step, agent, _, instruction in prepared],
+            workspace_snapshot,
+        )
+
+        executions: List[StepExecution] = []
+        project_summary: AgentResult | None = None
+        for (step, agent, agent_model, instruction), future in zip(prepared, pending):
+            with self._agent_error_logging(step, cancel=pending):
+                result = future.result()
             self.logger.on_agent_end(step, result)
             executions.append(StepExecution(step=step, result=result))
 
@@ -219,12 +455,12 @@ class MultiAgentOrchestrator:
                     last_result=result,
                     task=task,
                     workspace=workspace_snapshot,
+                    context=context,
                 )
                 executions.extend(extra_execs)
 
         if not executions:
-            factory = self.agent_model_factories.get("python", self.model_factory)
-            agent_model = factory()
+            agent_model = self._get_model("python")
             agent_cls = AGENT_REGISTRY["python"]
             fallback_step = PlanStep(agent="python", instruction=task, reason="fallback to python")
             self.logger.on_agent_start(fallback_step, task, "fallback")
@@ -239,8 +475,51 @@ class MultiAgentOrchestrator:
 
         final_result = self._finalize(task, executions, project_summary=project_summary)
         self.logger.on_final(final_result)
+        if self.plan_cache is not None and not forced_agent and planner.planned_by_model:
+            self.plan_cache.put(
+                task, workspace_snapshot, [asdict(step) for step in planned], model_identity(planner.model)
+            )
         return OrchestrationResult(final=final_result, steps=executions)
 
+    @contextmanager
+    def _agent_error_logging(self, step: PlanStep, cancel: Iterable[Future] = ()) -> Iterator[None]:
+        """Report an agent failure once, cancel the ``cancel`` futures, re-raise."""
+        try:
+            yield
+        except Exception as exc:
+            for future in cancel:
+                future.cancel()
+            self.logger.on_agent_error(step, exc)
+            raise
+
+    def _start_agent_runs(
+        self,
+        jobs: Sequence[Tuple[PlanStep, Agent, str, str]],
+        workspace: str,
+    ) -> List[Future]:
+        """Start ``agent.run`` for every job and return futures in job order.
+
+        Without parallelism each job runs lazily, when its future's result is
+        first requested. ``on_agent_start`` is logged as each job actually
+        begins, on a worker thread when jobs run in parallel.
+        """
+
+        def run(step: PlanStep, agent: Agent, instruction: str, plan_context: str) -> AgentResult:
+            self.logger.on_agent_start(step, instruction, plan_context)
+            return agent.run(task=instruction, plan_context=plan_context, workspace=workspace)
+
+        if len(jobs) <= 1 or self.max_parallel_steps <= 1:
+            return [_DeferredFuture(run, *job) for job in jobs]
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(jobs), self.max_parallel_steps),
+            thread_name_prefix="devopsys-step",
+        )
+        try:
+            return [executor.submit(run, *job) for job in jobs]
+        finally:
+            executor.shutdown(wait=False)
+
     def _ensure_project_plan(self, task: str, plan: List[PlanStep]) -> List[PlanStep]:
         if any(step.agent == "project_architect" for step in plan):
             return plan
@@ -285,50 +564,37 @@ class MultiAgentOrchestrator:
         project_root = self._allocate_project_root(spec, base_directory)
         executions: List[StepExecution] = []
         ready_files: List[str] = []
-
-        for file_spec in spec.files:
-            agent_name = select_agent_for_file(file_spec, spec)
-            agent_cls = AGENT_REGISTRY.get(agent_name)
-            if agent_cls is None:
-                raise RuntimeError(f"no agent registered for '{agent_name}' while generating {file_spec.path}")
-
-            factory = self.agent_model_factories.get(agent_name, self.model_factory)
-            agent_model = factory()
-            agent = agent_cls(agent_model)
-
-            instruction = build_instruction(file_spec, spec)
-            reason = f"project file: {file_spec.normalized_path}"
-            plan_context = format_plan_context_for_agent(agent_name, file_spec, spec, ready_files)
-            workspace_ctx = self._project_workspace_context(project_root, ready_files)
-            plan_step = PlanStep(agent=agent_name, instruction=instruction, reason=reason)
-
-            self.logger.on_agent_start(plan_step, instruction, plan_context)
-            try:
-                agent_result = agent.run(
-                    task=instruction,
-                    plan_context=plan_context,
-                    workspace=workspace_ctx,
-                )
-            except Exception as exc:  # pragma: no cover - pass through after logging
-                self.logger.on_agent_error(plan_step, exc)
-                raise
-
-            target_path = self._write_project_file(project_root, file_spec, agent_result.text)
-            rel_display = self._relative_display(target_path, base_directory)
-            stored_result = AgentResult(text=agent_result.text, filename=str(rel_display))
-            self.logger.on_agent_end(plan_step, stored_result)
-            executions.append(StepExecution(step=plan_step, result=stored_result))
-            ready_files.append(file_spec.normalized_path)
-
-            verifier_exec = self._invoke_verifier(
-                task=f"Syntax check for {file_spec.normalized_path}",
-                code=stored_result.text,
-                reason=f"syntax check for {file_spec.normalized_path}",
-                filename=str(target_path),
-                mode="syntax",
+        # Syntax checks overlap with the generation of later files; their
+        # verdicts are logged in plan order once every file is written.
+        checks: List[Tuple[PlanStep, str, Future]] = []
+        check_pool = (
+            ThreadPoolExecutor(max_workers=self.max_parallel_steps, thread_name_prefix="devopsys-verify")
+            if self.max_parallel_steps > 1
+            else None
+        )
+        try:
+            self._generate_project_layers(
+                spec,
+                project_root,
+                base_directory,
+                executions=executions,
+                ready_files=ready_files,
+                checks=checks,
+                check_pool=check_pool,
             )
-            if verifier_exec:
-                executions.append(verifier_exec)
+        except Exception:
+            for _, _, future in checks:
+                future.cancel()
+            raise
+        finally:
+            if check_pool is not None:
+                check_pool.shutdown(wait=False)
+
+        for check_step, check_context, future in checks:
+            self.logger.on_agent_start(check_step, check_step.instruction, check_context)
+            verdict = future.result()
+            self.logger.on_agent_end(check_step, verdict)
+            executions.append(StepExecution(step=check_step, result=verdict))
 
         env_step, env_message = self._maybe_create_uv_environment(spec, project_root)
         if env_step:
@@ -355,10 +621,87 @@ class MultiAgentOrchestrator:
         if runtime_message:
             summary_lines.append(runtime_message)
 
-        summary_text = "\n".join(line for line in summary_lines if line is not None)
+        summary_text = "\n".join(summary_lines)
         summary_result = AgentResult(text=summary_text.strip()) if summary_text.strip() else None
         return executions, summary_result
 
+    def _generate_project_layers(
+        self,
+        spec: ProjectSpec,
+        project_root: Path,
+        base_directory: Path | None,
+        *,
+        executions: List[StepExecution],
+        ready_files: List[str],
+        checks: List[Tuple[PlanStep, str, Future]],
+        check_pool: ThreadPoolExecutor | None,
+    ) -> None:
+        """Generate, write and log ``spec.files`` layer by layer.
+
+        Files in one layer only see the files finished in earlier layers, so
+        their LLM calls overlap. With ``max_parallel_steps`` at 1 every file is
+        its own layer, in plan order, and sees all files before it. Writing and logging run on the calling thread
+        in plan order. Each written file's syntax check is queued on
+        ``check_pool`` (or run inline) and appended to ``checks`` for the
+        caller to log once generation is done.
+        """
+        # Generated files are never edited afterwards, so later layers take
+        # their snippets from memory instead of reading them back.
+        written: Dict[str, str] = {}
+        layers = spec.layers() if self.max_parallel_steps > 1 else [[file_spec] for file_spec in spec.files]
+        for layer in layers:
+            layer_ready = list(ready_files)
+            workspace_ctx = self._project_workspace_context(project_root, layer_ready, written=written)
+            prepared: List[Tuple[ProjectFileSpec, PlanStep, Agent, str, str]] = []
+            for file_spec in layer:
+                agent_name = select_agent_for_file(file_spec, spec)
+                agent_cls = AGENT_REGISTRY.get(agent_name)
+                if agent_cls is None:
+                    raise RuntimeError(f"no agent registered for '{agent_name}' while generating {file_spec.path}")
+                agent = agent_cls(self._get_model(agent_name))
+                instruction = build_instruction(file_spec, spec)
+                reason = f"project file: {file_spec.normalized_path}"
+                plan_context = format_plan_context_for_agent(agent_name, file_spec, spec, layer_ready)
+                plan_step = PlanStep(agent=agent_name, instruction=instruction, reason=reason)
+                prepared.append((file_spec, plan_step, agent, instruction, plan_context))
+
+            pending = self._start_agent_runs(
+                [
+                    (plan_step, agent, instruction, plan_context)
+                    for _, plan_step, agent, instruction, plan_context in prepared
+                ],
+                workspace_ctx,
+            )
+            for (file_spec, plan_step, _, instruction, plan_context), future in zip(prepared, pending):
+                with self._agent_error_logging(plan_step, cancel=pending):
+                    agent_result = future.result()
+
+                target_path = self._write_project_file(project_root, file_spec, agent_result.text)
+                rel_display = self._relative_display(target_path, base_directory)
+                stored_result = AgentResult(text=agent_result.text, filename=str(rel_display))
+                self.logger.on_agent_end(plan_step, stored_result)
+                executions.append(StepExecution(step=plan_step, result=stored_result))
+                ready_files.append(file_spec.normalized_path)
+                written[file_spec.normalized_path] = agent_result.text
+
+                check = self._prepare_verifier(
+                    task=f"Syntax check for {file_spec.normalized_path}",
+                    code=stored_result.text,
+                    reason=f"syntax check for {file_spec.normalized_path}",
+                    filename=str(target_path),
+                    mode="syntax",
+                )
+                if check is None:
+                    continue
+                check_step, verifier, check_context = check
+                run_kwargs = {"task": check_step.instruction, "plan_context": check_context, "workspace": stored_result.text}
+                future = (
+                    check_pool.submit(verifier.run, **run_kwargs)
+                    if check_pool is not None
+                    else _completed_future(verifier.run, **run_kwargs)
+                )
+                checks.append((check_step, check_context, future))
+
     def _allocate_project_root(self, project: ProjectSpec, base: Path | None) -> Path:
         base_dir = (base or Path.cwd()).resolve()
         base_dir.mkdir(parents=True, exist_ok=True)
@@ -380,19 +723,30 @@ class MultiAgentOrchestrator:
         *,
         max_files: int = 5,
         max_bytes: int = 800,
+        written: Mapping[str, str] | None = None,
     ) -> str:
+        """Show the head of the last ``max_files`` ready files.
+
+        ``written`` maps paths to the text this run wrote for them; those
+        files are never re-read from disk.
+        """
         if not ready_files:
             return ""
         lines: List[str] = []
         for rel in list(ready_files)[-max_files:]:
-            path = project_root / rel
-            if not path.exists() or not path.is_file():
-                continue
-            try:
-                text = path.read_text(encoding="utf-8", errors="ignore")
-            except (OSError, UnicodeDecodeError):
-                continue
-            snippet = text[:max_bytes].rstrip()
+            text = written.get(rel) if written is not None else None
+            if text is not None:
+                raw = text.encode("utf-8")[:max_bytes]
+            else:
+                path = project_root / rel
+                if not path.exists() or not path.is_file():
+                    continue
+                try:
+                    with path.open("rb") as handle:
+                        raw = handle.read(max_bytes)
+                except OSError:
+                    continue
+            snippet = raw.decode("utf-8", errors="ignore").rstrip()
             if not snippet:
                 continue
             lines.append(f"--- {rel} ---")
@@ -405,13 +759,15 @@ class MultiAgentOrchestrator:
         file_spec: ProjectFileSpec,
         content: str,
     ) -> Path:
-        root_resolved = project_root.resolve()
-        relative = Path(file_spec.normalized_path)
-        target = (root_resolved / relative).resolve()
-        try:
-            target.relative_to(root_resolved)
-        except ValueError as exc:
-            raise RuntimeError(f"file path {file_spec.normalized_path} escapes project root") from exc
+        """Write ``content`` below ``project_root``, which must already be resolved.
+
+        ``_allocate_project_root`` returns a resolved directory that so far only
+        holds files written here, so a lexical ``normpath`` check catches every
+        escape without a ``realpath`` walk per file.
+        """
+        target = Path(os.path.normpath(project_root / file_spec.normalized_path))
+        if os.path.commonpath([target, project_root]) != str(project_root):
+            raise RuntimeError(f"file path {file_spec.normalized_path} escapes project root")
         ensure_directory(target)
         text = content if content.endswith("\n") else content + "\n"
         target.write_text(text, encoding="utf-8")
@@ -430,20 +786,7 @@ class MultiAgentOrchestrator:
             return target
 
     def _looks_like_project_request(self, task: str) -> bool:
-        text = task.lower()
-        hints = [
-            "project",
-            "проект",
-            "pyproject",
-            "readme",
-            "package",
-            "init.py",
-            "src/",
-            "структур",
-            "каталог",
-            "module",
-        ]
-        return any(hint in text for hint in hints)
+        return _PROJECT_HINT_RE.search(task) is not None
 
     def _maybe_create_uv_environment(
         self,
@@ -489,10 +832,12 @@ class MultiAgentOrchestrator:
 
     def _discover_entrypoint(self, project_root: Path) -> str | None:
         pyproject = project_root / "pyproject.toml"
-        if not pyproject.exists():
+        try:
+            stat = pyproject.stat()
+        except OSError:
             return None
         try:
-            data = tomllib.loads(pyproject.read_text(encoding="utf-8"))
+            data = _load_pyproject(str(pyproject), stat.st_mtime_ns, stat.st_size)
         except Exception:
             return None
         project_data = data.get("project")
@@ -542,14 +887,8 @@ class MultiAgentOrchestrator:
 
     @staticmethod
     def _parse_verifier_payload(raw: str) -> dict:
-        text = (raw or "").strip()
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        candidate = match.group(0) if match else text
-        try:
-            data = json.loads(candidate)
-            return data if isinstance(data, dict) else {}
-        except Exception:
-            return {}
+        data = _robust_json_loads(raw)
+        return data if isinstance(data, dict) else {}
 
     def _invoke_verifier(
         self,
@@ -561,6 +900,33 @@ class MultiAgentOrchestrator:
         mode: str | None = None,
         project_meta: dict | None = None,
     ) -> StepExecution | None:
+        prepared = self._prepare_verifier(
+            task=task,
+            code=code,
+            reason=reason,
+            filename=filename,
+            mode=mode,
+            project_meta=project_meta,
+        )
+        if prepared is None:
+            return None
+        step, verifier, plan_context = prepared
+        self.logger.on_agent_start(step, task, plan_context)
+        verdict = verifier.run(task=task, plan_context=plan_context, workspace=code)
+        self.logger.on_agent_end(step, verdict)
+        return StepExecution(step=step, result=verdict)
+
+    def _prepare_verifier(
+        self,
+        *,
+        task: str,
+        code: str,
+        reason: str,
+        filename: str | None = None,
+        mode: str | None = None,
+        project_meta: dict | None = None,
+    ) -> Tuple[PlanStep, Agent, str] | None:
+        """Return the verifier step, agent and plan context, or ``None`` to skip."""
         verifier_cls = AGENT_REGISTRY.get("verifier")
         if verifier_cls is None:
             return None
@@ -568,11 +934,7 @@ class MultiAgentOrchestrator:
         if (mode or "") != "project_runtime" and not (code or "").strip():
             return None
 
-        factory = self.agent_model_factories.get("verifier")
-        if factory is None:
-            factory = self.planner_model_factory or self.model_factory
-        agent_model = factory()
-        verifier = verifier_cls(agent_model)
+        verifier = verifier_cls(self._get_model("verifier"))
         step = PlanStep(agent="verifier", instruction=task, reason=reason)
         meta: dict = {}
         if mode:
@@ -581,14 +943,43 @@ class MultiAgentOrchestrator:
             meta["filename"] = filename
         if project_meta:
             meta["project"] = project_meta
-        plan_context = json.dumps(meta, ensure_ascii=False) if meta else ""
-        self.logger.on_agent_start(step, task, plan_context)
-        verdict = verifier.run(task=task, plan_context=plan_context, workspace=code)
-        self.logger.on_agent_end(step, verdict)
-        return StepExecution(step=step, result=verdict)
+        plan_context = jsonutil.dumps(meta) if meta else ""
+        return step, verifier, plan_context
 
     # --- Self-review and refinement for Python agent ---
 
+    def _model_factory_for(self, role: str) -> Callable[[], Model]:
+        factory = self.agent_model_factories.get(role)
+        if factory is not None:
+            return factory
+        if role in {"planner", "verifier"}:
+            return self.planner_model_factory or self.model_factory
+        return self.model_factory
+
+    def _get_model(self, role: str) -> Model:
+        factory = self._model_factory_for(role)
+        model = self._models.get(factory)
+        if model is None:
+            model = factory()
+            self._models[factory] = model
+        return model
+
+    def close(self) -> None:
+        """Close every pooled model, releasing their HTTP connections."""
+        models, self._models = list(self._models.values()), {}
+        self._reviewer_chain = None
+        for model in models:
+            model.close()
+        if self.plan_cache is not None:
+            self.plan_cache.close()
+        if self.generation_cache is not None:
+            self.generation_cache.close()
+
+    def _get_reviewer_chain(self):
+        if self._reviewer_chain is None:
+            self._reviewer_chain = _REVIEW_TEMPLATE | model_runnable(self._get_model("planner")) | StrOutputParser()
+        return self._reviewer_chain
+
     def _review_and_refine_python(
         self,
         *,
@@ -597,31 +988,19 @@ class MultiAgentOrchestrator:
         task: str,
         workspace: str,
         max_attempts: int = 6,
+        context: Optional[TaskContext] = None,
     ) -> List[StepExecution]:
-        reviewer_model = (self.planner_model_factory or self.model_factory)()
+        reviewer_model = self._get_model("planner")
         if isinstance(reviewer_model, DummyModel):
             return []
 
         verifier_available = AGENT_REGISTRY.get("verifier") is not None
         if not verifier_available:
-            review_prompt = PromptTemplate.from_template(
-                (
-                    "You are a strict code reviewer. Assess if the Python script fulfills the task.\n"
-                    "Return ONLY JSON with keys \"ok\" (boolean), \"reason\" (string), and \"missing\" (array of strings).\n"
-                    "Example: {{\"ok\": false, \"reason\": \"does not draw ASCII square\", \"missing\": [\"render square\"]}}\n"
-                    "Set ok=true only if the script directly implements the task without unrelated features or external calls.\n\n"
-                    "Task:\n{task}\n\n"
-                    "Script:\n```python\n{code}\n```\n"
-                )
-            )
-            chain = review_prompt | model_runnable(reviewer_model) | StrOutputParser()
+            chain = self._get_reviewer_chain()
 
         def _parse_review(raw: str) -> dict:
-            text = (raw or "").strip()
-            m = re.search(r"\{.*\}", text, re.DOTALL)
-            cand = m.group(0) if m else text
+            data = _robust_json_loads(raw)
             try:
-                data = json.loads(cand)
                 if not isinstance(data, dict):
                     raise ValueError("review JSON not object")
                 if "ok" not in data:
@@ -642,27 +1021,30 @@ class MultiAgentOrchestrator:
                 if forbidden is not None and not isinstance(forbidden, list):
                     data["forbidden"] = []
                 return data
-            except (json.JSONDecodeError, ValueError):
+            except ValueError:
                 return {"ok": False, "reason": "review parse error", "missing": []}
 
         attempts: List[StepExecution] = []
         current_result = last_result
         last_outcome: dict | None = None
-
-        task_lc = (task or "").lower()
-        gpu_refinement_hint = (
-            "When gathering GPU utilisation, call subprocess.run("
-            "['nvidia-smi', '--query-gpu=utilization.gpu', "
-            "'--format=csv,noheader,nounits'], capture_output=True, text=True, check=False) without shell=True. "
-            "Gracefully handle FileNotFoundError or non-zero return codes by printing a clear message "
-            "and exiting cleanly (use sys.exit(0) after the message). "
-            "Provide one line per GPU with its utilisation or an informative fallback when data is unavailable."
-        )
-        directory_refinement_hint = (
-            "List directories via os.scandir(path) filtered with entry.is_dir(). "
-            "Expose an argparse --path argument defaulting to '.', sort the resulting folder names, "
-            "and print them one per line."
-        )
+        last_ok = False
+        # Whether the latest verdict is a local audit one, and whether the loop
+        # ended on a script identical to the one that verdict judged.
+        last_static = False
+        plateaued = False
+
+        def _record_static_verdict(reason: str, missing: list[str]) -> dict:
+            # ast.parse already rejected the script; the LLM verifier would
+            # only restate that, so record the verdict locally instead.
+            outcome = {"ok": False, "reason": reason, "missing": missing}
+            audit_step = PlanStep(agent="verifier", instruction=task, reason="static syntax audit")
+            audit_result = AgentResult(text=jsonutil.dumps(outcome))
+            self.logger.on_agent_start(audit_step, task, audit_step.reason)
+            self.logger.on_agent_end(audit_step, audit_result)
+            attempts.append(StepExecution(step=audit_step, result=audit_result))
+            return outcome
+
+        task_lc = context.task_lc if context is not None else (task or "").lower()
         dynamic_max_attempts = 8 if ("matplotlib" in task_lc) else max_attempts
 
         for attempt_idx in range(1, dynamic_max_attempts + 1):
@@ -671,7 +1053,10 @@ class MultiAgentOrchestrator:
                 code=current_result.text,
             )
 
-            if verifier_available:
+            last_static = verifier_available and not audit_ok
+            if last_static:
+                outcome = _record_static_verdict(audit_reason, audit_missing)
+            elif verifier_available:
                 verifier_exec = self._invoke_verifier(
                     task=task,
                     code=current_result.text,
@@ -694,6 +1079,7 @@ class MultiAgentOrchestrator:
             ok_value = outcome.get("ok", True)
             ok = bool(ok_value) if isinstance(ok_value, bool) else str(ok_value).strip().lower() in {"true", "1", "yes"}
             if ok:
+                last_ok = True
                 break
 
             reason = outcome.get("reason", "")
@@ -706,63 +1092,100 @@ class MultiAgentOrchestrator:
 
             suggested_prompt = outcome.get("suggested_prompt")
             base_instruction = (
-                suggested_prompt.strip()
+                suggested_prompt
                 if isinstance(suggested_prompt, str) and suggested_prompt.strip()
                 else original_step.instruction
-            )
+            ).strip()
 
-            refined_parts = [base_instruction.strip()]
-            refined_parts.append(
-                f"Previous attempt did not fulfill the task: {feedback}."
-                + (missing_section if missing_section else "")
+            refined_instruction = (
+                (f"{base_instruction}\n" if base_instruction else "")
+                + f"Previous attempt did not fulfill the task: {feedback}.{missing_section}\n"
+                + "Regenerate from scratch. Output ONLY Python code (no markdown/prose).\n"
+                + "Use only the standard library unless explicitly requested.\n"
             )
-            refined_parts.append("Regenerate from scratch. Output ONLY Python code (no markdown/prose).")
-            refined_parts.append("Use only the standard library unless explicitly requested.")
-
-            reason_lc = reason.lower() if isinstance(reason, str) else ""
-            combined_missing = " ".join(missing_list).lower()
+            refined_lc = refined_instruction.lower()
 
-            needs_gpu_hint = any(
-                key in value
-                for value in (task_lc, reason_lc, combined_missing)
-                for key in ("gpu", "nvidia-smi", "cuda")
+            # Keywords contain no spaces, so joining with one cannot create
+            # matches that span two of the sources.
+            hint_source = " ".join(
+                (task_lc, reason.lower() if isinstance(reason, str) else "", " ".join(missing_list).lower())
             )
-            if needs_gpu_hint and not any("nvidia-smi" in part.lower() for part in refined_parts):
-                refined_parts.append(gpu_refinement_hint)
-
-            dir_keywords = ("directory", "directories", "folder", "folders")
-            needs_directory_hint = any(keyword in task_lc for keyword in dir_keywords) or any(
-                keyword in value for value in (reason_lc, combined_missing) for keyword in dir_keywords
+            if "nvidia-smi" not in refined_lc and any(key in hint_source for key in _GPU_KEYWORDS):
+                refined_instruction += _GPU_REFINEMENT_HINT + "\n"
+            if "scandir" not in refined_lc and any(key in hint_source for key in _DIR_KEYWORDS):
+                refined_instruction += _DIRECTORY_REFINEMENT_HINT + "\n"
+
+            # With several candidates one batched request samples them all (the
+            # backend shares the prompt prefix) and the first syntactically
+            # valid one goes on to the next verification.
+            candidate_count = max(1, self.refinement_candidates)
+            python_model = self._get_model("python")
+            agent = AGENT_REGISTRY["python"](python_model)
+            # Only a greedy backend repeats itself; caching a sampled answer
+            # would stop later attempts from drawing a different one.
+            cache_key = None
+            if candidate_count == 1 and self.generation_cache is not None and is_deterministic(python_model):
+                cache_key = generation_cache_key("python", python_model, refined_instruction, workspace)
+            base_reason = f"refinement attempt {attempt_idx}"
+            if candidate_count > 1:
+                candidate_steps = [
+                    PlanStep(agent="python", instruction=refined_instruction, reason=f"{base_reason}.{idx}")
+                    for idx in range(1, candidate_count + 1)
+                ]
+            else:
+                candidate_steps = [PlanStep(agent="python", instruction=refined_instruction, reason=base_reason)]
+
+            for refined_step in candidate_steps:
+                self.logger.on_agent_start(refined_step, refined_instruction, refined_step.reason)
+            with self._agent_error_logging(candidate_steps[0]):
+                if candidate_count > 1:
+                    refined_results = agent.run_batch(
+                        task=refined_instruction, n=candidate_count, plan_context=base_reason, workspace=workspace
+                    )
+                else:
+                    refined = self.generation_cache.get(cache_key) if cache_key else None
+                    if refined is None:
+                        refined = agent.run(task=refined_instruction, plan_context=base_reason, workspace=workspace)
+                        if cache_key:
+                            self.generation_cache.put(cache_key, refined)
+                    refined_results = [refined]
+            candidates: List[StepExecution] = []
+            for refined_step, refined_result in zip(candidate_steps, refined_results):
+                self.logger.on_agent_end(refined_step, refined_result)
+                candidates.append(StepExecution(step=refined_step, result=refined_result))
+
+            chosen = next(
+                (
+                    candidate
+                    for candidate in candidates
+                    if self._static_python_audit(task=task, code=candidate.result.text)[0]
+                ),
+                candidates[0],
             )
-            if needs_directory_hint and not any("scandir" in part.lower() for part in refined_parts):
-                refined_parts.append(directory_refinement_hint)
-            refined_instruction = "\n".join(part.strip() for part in refined_parts if part.strip()) + "\n"
+            # The chosen candidate goes last so verification and _finalize
+            # pair with it, exactly as with a single regeneration.
+            attempts.extend(candidate for candidate in candidates if candidate is not chosen)
+            attempts.append(chosen)
+            plateaued = chosen.result.text == current_result.text
+            current_result = chosen.result
+            if plateaued:
+                # The model answered the feedback with the very script it was
+                # given; more attempts would keep repeating it. The final
+                # verification below still judges this script.
+                break
 
-            agent_model = self.agent_model_factories.get("python", self.model_factory)()
-            agent_cls = AGENT_REGISTRY["python"]
-            agent = agent_cls(agent_model)
-            refined_step = PlanStep(
-                agent="python",
-                instruction=refined_instruction,
-                reason=f"refinement attempt {attempt_idx}",
+        if verifier_available and not last_ok:
+            # The loop breaks on an accepted verdict, which then is the last
+            # recorded verifier step, or on a plateau, whose repeated script
+            # has not been verified. A plateau, like running out of attempts,
+            # leaves last_ok False and gets a final check. A script the static
+            # audit rejects gets a local verdict instead, or keeps the one the
+            # loop plateaued on.
+            audit_ok, audit_reason, audit_missing, _ = self._static_python_audit(
+                task=task,
+                code=current_result.text,
             )
-            self.logger.on_agent_start(refined_step, refined_instruction, refined_step.reason)
-            try:
-                refined_result = agent.run(task=refined_instruction, plan_context=refined_step.reason, workspace=workspace)
-            except Exception as exc:  # pragma: no cover - propagate
-                self.logger.on_agent_error(refined_step, exc)
-                raise
-            self.logger.on_agent_end(refined_step, refined_result)
-            attempts.append(StepExecution(step=refined_step, result=refined_result))
-            current_result = refined_result
-
-        if verifier_available:
-            needs_final = True
-            if attempts and attempts[-1].step.agent == "verifier":
-                parsed_last = _parse_review(attempts[-1].result.text)
-                if parsed_last.get("ok") is True:
-                    needs_final = False
-            if needs_final:
+            if audit_ok:
                 verifier_exec = self._invoke_verifier(
                     task=task,
                     code=current_result.text,
@@ -771,51 +1194,47 @@ class MultiAgentOrchestrator:
                 )
                 if verifier_exec:
                     attempts.append(verifier_exec)
+            elif not (plateaued and last_static):
+                _record_static_verdict(audit_reason, audit_missing)
 
         return attempts
+
     @staticmethod
     def _static_python_audit(
         task: str,
         code: str,
     ) -> tuple[bool, str, list[str], dict[str, bool]]:
-        try:
-            import ast as _ast
-            _ast.parse(code or "")
-        except SyntaxError as _exc:
+        error = python_syntax_error(code or "")
+        if error is not None:
             return (
                 False,
-                f"invalid python syntax: {_exc.msg}",
+                f"invalid python syntax: {error[0]}",
                 ["return valid Python code"],
                 {"syntax_error": True},
             )
         return True, "", [], {}
 
-    def _prune_plan(self, plan: List[PlanStep], task: str) -> List[PlanStep]:
+    def _prune_plan(self, plan: List[PlanStep], task: str, route: Optional[Route] = None) -> List[PlanStep]:
         if not plan:
             return plan
 
         plan = [step for step in plan if step.agent != "verifier"]
 
-        route = Router().classify(task)
+        route = route or classify_route(task)
 
         if route.agent == "docker":
             docker_steps = [step for step in plan if step.agent == "docker"]
             if docker_steps:
                 return docker_steps
 
-        ordered: List[PlanStep] = []
-        seen = set()
-
-        for step in plan:
-            if step.agent == route.agent and step.agent not in seen:
-                ordered.append(step)
-                seen.add(step.agent)
-
+        # Keep the first step per agent in plan order, routed agent first.
+        first_steps: dict[str, PlanStep] = {}
         for step in plan:
-            if step.agent not in seen:
-                ordered.append(step)
-                seen.add(step.agent)
-
+            first_steps.setdefault(step.agent, step)
+        primary = first_steps.pop(route.agent, None)
+        ordered = list(first_steps.values())
+        if primary is not None:
+            ordered.insert(0, primary)
         return ordered
 
     def _finalize(
@@ -832,32 +1251,35 @@ class MultiAgentOrchestrator:
 
         # Compliance-gated finalize: prefer last verifier verdict
         def _parse_verdict(raw: str) -> dict:
-            txt = (raw or "").strip()
-            import re, json as _json
-            m = re.search(r"\{.*\}", txt, re.DOTALL)
-            cand = m.group(0) if m else txt
-            try:
-                data = _json.loads(cand)
-                return data if isinstance(data, dict) else {}
-            except Exception:
-                return {}
+            data = _robust_json_loads(raw)
+            return data if isinstance(data, dict) else {}
 
+        # One backward pass finds the last verifier, the last non-verifier step
+        # before it (the artefact it judged) and the last python step. Once the
+        # judged step is known the python index is no longer needed, so the
+        # scan stops there.
         last_verifier_idx: int | None = None
+        verified_idx: int | None = None
+        last_python_idx: int | None = None
         for idx in range(len(executions) - 1, -1, -1):
-            if executions[idx].step.agent == "verifier":
-                last_verifier_idx = idx
+            agent_name = executions[idx].step.agent
+            if agent_name == "verifier":
+                if last_verifier_idx is None:
+                    last_verifier_idx = idx
+                continue
+            if last_verifier_idx is not None:
+                verified_idx = idx
                 break
+            if agent_name == "python" and last_python_idx is None:
+                last_python_idx = idx
 
         if last_verifier_idx is not None:
             verifier_exec = executions[last_verifier_idx]
             verifier_result = verifier_exec.result
             verdict = _parse_verdict(verifier_result.text)
             candidate_result: AgentResult | None = None
-            for j in range(last_verifier_idx - 1, -1, -1):
-                if executions[j].step.agent == "verifier":
-                    continue
-                candidate_result = executions[j].result
-                break
+            if verified_idx is not None:
+                candidate_result = executions[verified_idx].result
 
             if verdict.get("ok") is True and candidate_result is not None:
                 if candidate_result.filename:
@@ -877,9 +1299,8 @@ class MultiAgentOrchestrator:
 
             return AgentResult(text=verifier_result.text)
 
-        for exec_step in reversed(executions):
-            if exec_step.step.agent == "python":
-                return AgentResult(text=exec_step.result.text)
+        if last_python_idx is not None:
+            return AgentResult(text=executions[last_python_idx].result.text)
 
         sections = []
         for exec_step in executions:
@@ -0,0 +1,76 @@
+"""Exact-match cache for lead-planner output.
+
+The planner is the first LLM round-trip of every orchestration. Repeating the
+same request against the same workspace yields the same plan, so the plan of
+a completed run can be served again without asking the model.
+
+Keys combine the normalised task (whitespace collapsed, case folded), the
+workspace snapshot the planner saw and the planner model's identity (backend
+and model name). A change in any of them misses the cache.
+Entries live in memory; pass ``path`` to also persist them in SQLite so
+later CLI runs benefit too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from . import jsonutil
+from .sqlite_cache import SQLiteLRUCache, default_cache_dir
+
+PlanItems = List[Dict[str, str]]
+
+
+def default_plan_cache_path() -> Path:
+    return default_cache_dir() / "plan_cache.sqlite"
+
+
+def normalise_task(task: str) -> str:
+    return " ".join(task.split()).casefold()
+
+
+def plan_cache_key(task: str, workspace: str, model: str = "") -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (normalise_task(task), workspace, model):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _decode_plan(text: str) -> Optional[PlanItems]:
+    try:
+        data = jsonutil.loads(text)
+    except jsonutil.JSONDecodeError:
+        return None
+    if not isinstance(data, list):
+        return None
+    return [item for item in data if isinstance(item, dict)]
+
+
+class PlanCache:
+    """Map from (task, workspace, planner model) to the plan steps that served it."""
+
+    def __init__(self, max_entries: int = 128, path: str | Path | None = None) -> None:
+        self._store: SQLiteLRUCache[PlanItems] = SQLiteLRUCache(
+            max_entries, path, encode=jsonutil.dumps, decode=_decode_plan
+        )
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, task: str, workspace: str, model: str = "") -> Optional[PlanItems]:
+        items = self._store.get(plan_cache_key(task, workspace, model))
+        if items is None:
+            return None
+        return [dict(item) for item in items]
+
+    def put(self, task: str, workspace: str, plan: Sequence[Mapping[str, str]], model: str = "") -> None:
+        self._store.put(plan_cache_key(task, workspace, model), [dict(item) for item in plan])
+
+    def close(self) -> None:
+        self._store.close()
+
+
+__all__ = ["PlanCache", "default_plan_cache_path", "normalise_task", "plan_cache_key"]
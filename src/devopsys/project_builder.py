@@ -1,33 +1,43 @@
 from __future__ import annotations
 
-import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, List, Sequence
 
+from . import jsonutil
 from .agents.registry import AGENT_REGISTRY
 
 
-@dataclass
+_SLUG_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def _extension_of(normalized_path: str) -> str:
+    path = Path(normalized_path)
+    name = path.name
+    if name.startswith(".") and name != ".env":
+        return name
+    if name.lower() == "dockerfile":
+        return "dockerfile"
+    return path.suffix.lower()
+
+
+@dataclass(slots=True)
 class ProjectFileSpec:
     path: str
     goal: str
     agent_hint: str | None
     requirements: Sequence[str]
+    # ``None`` (nothing declared) means the file needs every earlier file.
+    depends_on: Sequence[str] | None = None
+    # Derived from ``path`` once; specs are not mutated after construction.
+    normalized_path: str = field(init=False, repr=False, compare=False)
+    extension: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def normalized_path(self) -> str:
-        return self.path.replace("\\", "/").strip()
-
-    @property
-    def extension(self) -> str:
-        name = Path(self.normalized_path).name
-        if name.startswith(".") and name != ".env":
-            return name
-        if name.lower() == "dockerfile":
-            return "dockerfile"
-        return Path(self.normalized_path).suffix.lower()
+    def __post_init__(self) -> None:
+        self.normalized_path = self.path.replace("\\", "/").strip()
+        self.extension = _extension_of(self.normalized_path)
 
 
 @dataclass
@@ -42,8 +52,8 @@ class ProjectSpec:
     @classmethod
     def from_json(cls, payload: str) -> ProjectSpec:
         try:
-            data = json.loads(payload)
-        except json.JSONDecodeError as exc:  # pragma: no cover - defensive
+            data = jsonutil.loads(payload)
+        except jsonutil.JSONDecodeError as exc:  # pragma: no cover - defensive
             raise ValueError(f"project plan is not valid JSON: {exc}") from exc
         if not isinstance(data, dict):
             raise ValueError("project plan JSON must be an object")
@@ -68,12 +78,23 @@ class ProjectSpec:
                 for req in requirements_raw
                 if str(req).strip()
             ]
+            depends_raw = item.get("depends_on")
+            if isinstance(depends_raw, str):
+                depends_raw = [depends_raw]
+            depends_on = None
+            if depends_raw is not None:
+                depends_on = tuple(
+                    str(dep).replace("\\", "/").strip()
+                    for dep in depends_raw
+                    if str(dep).strip()
+                )
             files.append(
                 ProjectFileSpec(
                     path=path,
                     goal=goal,
                     agent_hint=agent_hint,
                     requirements=tuple(requirements),
+                    depends_on=depends_on,
                 )
             )
         return cls(
@@ -87,10 +108,23 @@ class ProjectSpec:
 
     @property
     def slug(self) -> str:
-        slug = re.sub(r"[^a-z0-9]+", "-", self.project_name.lower())
-        slug = slug.strip("-")
+        slug = _SLUG_SEPARATORS.sub("-", self.project_name.lower()).strip("-")
         return slug or "project"
 
+    @cached_property
+    def instruction_context(self) -> str:
+        """Project-wide lines shared by every file's ``build_instruction``."""
+        lines: List[str] = []
+        summary = self.summary.strip()
+        if summary:
+            lines.append(f"Project summary: {summary}.")
+        if self.language:
+            lines.append(f"Primary language: {self.language}.")
+        if self.tasks:
+            lines.append("Key capabilities:")
+            lines.extend(f"- {item}" for item in self.tasks)
+        return "\n".join(lines)
+
     def describe(self) -> str:
         lines: List[str] = []
         if self.summary:
@@ -101,6 +135,48 @@ class ProjectSpec:
                 lines.append(f"- {item}")
         return "\n".join(lines).strip()
 
+    def layers(self) -> List[List[ProjectFileSpec]]:
+        """Group ``files`` into generation layers, keeping plan order inside each.
+
+        A file lands in the first layer after every file listed in its
+        ``depends_on``; a file that declares nothing waits for every file
+        before it, as in sequential generation. Only an explicit empty list
+        marks a file as independent. Unknown paths are ignored; files caught
+        in a dependency cycle are appended as one final layer.
+        """
+        known = {spec.normalized_path for spec in self.files}
+        requires: Dict[str, set[str]] = {}
+        earlier: List[str] = []
+        for spec in self.files:
+            declared = earlier if spec.depends_on is None else spec.depends_on
+            requires[spec.normalized_path] = {dep for dep in declared if dep in known} - {spec.normalized_path}
+            earlier.append(spec.normalized_path)
+        remaining = list(self.files)
+        done: set[str] = set()
+        layers: List[List[ProjectFileSpec]] = []
+        while remaining:
+            layer = [spec for spec in remaining if requires[spec.normalized_path] <= done]
+            if not layer:
+                layers.append(remaining)
+                break
+            layers.append(layer)
+            done.update(spec.normalized_path for spec in layer)
+            remaining = [spec for spec in remaining if spec.normalized_path not in done]
+        return layers
+
+
+# ``ProjectFileSpec.extension`` reports a bare "dockerfile" for files named
+# Dockerfile, so one lookup covers both spellings.
+_EXTENSION_AGENTS = {
+    ".py": "python",
+    ".rs": "rust",
+    ".sh": "bash",
+    ".bash": "bash",
+    ".dockerfile": "docker",
+    "dockerfile": "docker",
+    **dict.fromkeys((".md", ".toml", ".yaml", ".yml", ".json", ".txt", ".ini", ".cfg"), "universal"),
+}
+
 
 def _agent_exists(name: str | None) -> bool:
     return bool(name and name in AGENT_REGISTRY)
@@ -111,16 +187,9 @@ def select_agent_for_file(file_spec: ProjectFileSpec, project: ProjectSpec) -> s
         return file_spec.agent_hint  # type: ignore[return-value]
 
     ext = file_spec.extension
-    if ext in {".py"}:
-        return "python"
-    if ext in {".rs"}:
-        return "rust"
-    if ext in {".sh", ".bash"}:
-        return "bash"
-    if ext == ".dockerfile" or ext == "dockerfile" or Path(file_spec.normalized_path).name.lower() == "dockerfile":
-        return "docker"
-    if ext in {".md", ".toml", ".yaml", ".yml", ".json", ".txt", ".ini", ".cfg"}:
-        return "universal"
+    agent = _EXTENSION_AGENTS.get(ext)
+    if agent is not None:
+        return agent
     if project.language == "python" and ext == "":
         return "python" if file_spec.goal.lower().startswith("module") else "universal"
     return "universal"
@@ -131,19 +200,11 @@ def build_instruction(file_spec: ProjectFileSpec, project: ProjectSpec) -> str:
     details: List[str] = [header]
     if file_spec.goal:
         details.append(f"Goal: {file_spec.goal}.")
-    summary = project.summary.strip()
-    if summary:
-        details.append(f"Project summary: {summary}.")
-    if project.language:
-        details.append(f"Primary language: {project.language}.")
-    if project.tasks:
-        details.append("Key capabilities:")
-        for item in project.tasks:
-            details.append(f"- {item}")
+    if project.instruction_context:
+        details.append(project.instruction_context)
     if file_spec.requirements:
         details.append("File requirements:")
-        for req in file_spec.requirements:
-            details.append(f"- {req}")
+        details.extend(f"- {req}" for req in file_spec.requirements)
     details.append("Ensure the file is production-ready and consistent with the rest of the project.")
     return "\n".join(details).strip()
 
@@ -166,7 +227,7 @@ def format_plan_context_for_agent(
             "language": project.language,
             "ready_files": list(ready_files),
         }
-        return json.dumps(payload, ensure_ascii=False)
+        return jsonutil.dumps(payload)
     lines: List[str] = []
     if project.summary:
         lines.append(project.summary)
@@ -189,8 +250,7 @@ def summarize_created_files(root: Path, files: Sequence[ProjectFileSpec]) -> str
     if not files:
         return "\n".join(lines)
     lines.append("Generated files:")
-    for spec in files:
-        lines.append(f"- {spec.normalized_path}")
+    lines.extend(f"- {spec.normalized_path}" for spec in files)
     return "\n".join(lines)
 
 
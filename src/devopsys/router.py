@@ -1,6 +1,7 @@
 from __future__ import annotations
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Literal, Optional
 
 AgentName = Literal["docker", "python", "rust", "bash", "linux", "project_architect"]
@@ -38,7 +39,33 @@ KEYWORDS = {
     ],
 }
 
-@dataclass
+def _literal_alternatives(pattern: str) -> Optional[tuple[str, ...]]:
+    """Split ``a|b\\.c`` into plain substrings, or ``None`` if it needs regex."""
+    pieces = tuple(piece.replace("\\.", ".") for piece in pattern.split("|"))
+    if all(piece and re.escape(piece) == raw for piece, raw in zip(pieces, pattern.split("|"))):
+        return pieces
+    return None
+
+
+def _compile(patterns: list[str]) -> tuple[tuple[tuple[str, ...], ...], tuple[re.Pattern[str], ...]]:
+    literals = []
+    regexes = []
+    for pattern in patterns:
+        alternatives = _literal_alternatives(pattern)
+        if alternatives is None:
+            regexes.append(re.compile(pattern))
+        else:
+            literals.append(alternatives)
+    return tuple(literals), tuple(regexes)
+
+
+# Compiled once at import. Scores count how many distinct patterns of an agent
+# match, so patterns stay separate: a single alternation would consume
+# overlapping matches ("pyproject" vs "pyproject\.toml") and change routing.
+# Patterns made only of plain words are tested with ``in`` instead of regex.
+_COMPILED = tuple((agent, _compile(patterns)) for agent, patterns in KEYWORDS.items())
+
+@dataclass(frozen=True)
 class Route:
     agent: AgentName
     score: float
@@ -48,8 +75,9 @@ class Router:
     def classify(self, text: str) -> Route:
         text_l = text.lower()
         best: Optional[Route] = None
-        for agent, patterns in KEYWORDS.items():
-            hits = sum(1 for p in patterns if re.search(p, text_l))
+        for agent, (literals, regexes) in _COMPILED:
+            hits = sum(1 for words in literals if any(word in text_l for word in words))
+            hits += sum(1 for p in regexes if p.search(text_l))
             if hits:
                 extra = 0
                 if agent == "docker" and "dockerfile" in text_l:
@@ -61,3 +89,12 @@ class Router:
         if best is None:
             best = Route(agent="python", score=0.0, reason="fallback to python")
         return best
+
+
+_ROUTER = Router()
+
+
+@lru_cache(maxsize=256)
+def classify(text: str) -> Route:
+    """``Router().classify`` memoised per text; routes are immutable."""
+    return _ROUTER.classify(text)
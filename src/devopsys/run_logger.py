@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from textwrap import shorten
-import ast
 from typing import TYPE_CHECKING, Optional, Sequence
 
 from rich.console import Console
 from rich.panel import Panel
 
+from .agents.python_utils import python_syntax_error
+
 if TYPE_CHECKING:  # pragma: no cover - import only for type checking
     from .agents.base import AgentResult
     from .orchestrator import PlanStep
@@ -16,7 +17,13 @@ def _preview(text: str, *, limit: int = 400) -> str:
     data = (text or "").strip()
     if not data:
         return "<empty>"
-    return shorten(data.replace("\n", " ⏎ "), width=limit, placeholder=" …")
+    # Only the head of the text can reach the preview, so large outputs are
+    # cut before the newline replacement and whitespace collapsing.
+    head = data[: limit * 4]
+    preview = shorten(head.replace("\n", " ⏎ "), width=limit, placeholder=" …")
+    if len(head) < len(data) and not preview.endswith(" …"):
+        preview += " …"
+    return preview
 
 
 class NullRunLogger:
@@ -58,12 +65,18 @@ class RunLogger(NullRunLogger):
     ) -> None:
         self.console = console
         self.show_workspace_snapshot = show_workspace_snapshot
+        # 0 disables the text previews and output panels altogether.
         self.preview_limit = preview_limit
 
+    @property
+    def _previews(self) -> bool:
+        """Whether preview text would be shown; building it is skipped otherwise."""
+        return self.preview_limit > 0 and not self.console.quiet
+
     def on_start(self, task: str, workspace: str) -> None:
         self.console.rule("[bold cyan]Task")
         self.console.log(task.strip() or "<empty task>")
-        if self.show_workspace_snapshot:
+        if self.show_workspace_snapshot and self._previews:
             self.console.rule("[bold yellow]Workspace Snapshot")
             preview = _preview(workspace, limit=self.preview_limit)
             self.console.print(Panel(preview, title="workspace", expand=False))
@@ -80,6 +93,8 @@ class RunLogger(NullRunLogger):
 
     def on_agent_start(self, step: "PlanStep", instruction: str, plan_context: str) -> None:
         self.console.rule(f"[bold magenta]Agent → {step.agent}")
+        if not self._previews:
+            return
         self.console.log("instruction", _preview(instruction, limit=self.preview_limit))
         if plan_context:
             self.console.log("context", _preview(plan_context, limit=self.preview_limit))
@@ -90,16 +105,17 @@ class RunLogger(NullRunLogger):
             details.append(f"file={result.filename}")
         details.append(f"size={len(result.text or '')} chars")
         self.console.log("result", ", ".join(details))
-        preview = _preview(result.text, limit=self.preview_limit)
-        self.console.print(Panel(preview, title=f"{step.agent} output", expand=False))
+        if self._previews:
+            preview = _preview(result.text, limit=self.preview_limit)
+            self.console.print(Panel(preview, title=f"{step.agent} output", expand=False))
         # Best-effort syntax check for Python outputs with a concise status line.
-        try:
-            is_python = (result.filename or "").endswith(".py") or step.agent == "python"
-            if is_python and (result.text or "").strip():
-                ast.parse(result.text)
+        is_python = (result.filename or "").endswith(".py") or step.agent == "python"
+        if is_python and (result.text or "").strip():
+            error = python_syntax_error(result.text)
+            if error is None:
                 self.console.log("syntax", "OK")
-        except SyntaxError as exc:  # pragma: no cover - non-critical logging
-            self.console.log("syntax", f"ERROR: {exc.msg} (line {exc.lineno})")
+            else:  # pragma: no cover - non-critical logging
+                self.console.log("syntax", f"ERROR: {error[0]} (line {error[1]})")
 
     def on_agent_error(self, step: "PlanStep", error: BaseException) -> None:
         self.console.rule(f"[bold red]Agent Error → {step.agent}")
@@ -109,7 +125,8 @@ class RunLogger(NullRunLogger):
         self.console.rule("[bold blue]Final Result")
         desc = f"file={result.filename}" if result.filename else "text"
         self.console.log(desc)
-        self.console.print(Panel(_preview(result.text, limit=self.preview_limit), title="final", expand=False))
+        if self._previews:
+            self.console.print(Panel(_preview(result.text, limit=self.preview_limit), title="final", expand=False))
 
 
 __all__ = [
@@ -1,29 +1,105 @@
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+"""Runtime configuration read from ``DEVOPSYS_*`` variables and ``.env``.
 
-class Settings(BaseSettings):
-    model_config = SettingsConfigDict(env_prefix="DEVOPSYS_", env_file=".env", extra="ignore")
+Each field maps to ``DEVOPSYS_<FIELD>`` (case-insensitive). Values from the
+process environment win over the ones in ``.env``. The environment is read
+once with a single scan, so importing this module stays cheap on CLI start.
+"""
 
-    backend: str = Field(default="dummy")
-    model: str = Field(default="codellama:7b-instruct")
-    ollama_host: str = Field(default="http://127.0.0.1:11434")
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, fields
+from functools import cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+ENV_PREFIX = "DEVOPSYS_"
+ENV_FILE = ".env"
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    backend: str = "dummy"
+    model: str = "codellama:7b-instruct"
+    # Optional smaller models for the JSON-only roles (plan, verdict), e.g. a
+    # quantised "qwen2.5:1.5b-instruct-q4_K_M"; empty means use ``model``.
+    planner_model: str = ""
+    verifier_model: str = ""
+    ollama_host: str = "http://127.0.0.1:11434"
 
     temperature: float = 0.2
     max_tokens: int = 1024
     ollama_timeout: float = 300.0
+    # Seconds to wait for the lead planner before using the keyword router's
+    # plan instead; 0 (the default) waits as long as the backend timeout.
+    plan_timeout: float = 0.0
 
-    openai_api_key: str = Field(default="")
-    openai_base_url: str = Field(default="https://api.openai.com/v1")
-    openai_model: str = Field(default="gpt-4o-mini")
+    openai_api_key: str = ""
+    openai_base_url: str = "https://api.openai.com/v1"
+    openai_model: str = "gpt-4o-mini"
     openai_timeout: float = 120.0
-    openai_system_prompt: str | None = Field(default=None)
+    openai_system_prompt: Optional[str] = None
 
-    deepseek_api_key: str = Field(default="")
-    deepseek_base_url: str = Field(default="https://api.deepseek.com/v1")
-    deepseek_model: str = Field(default="deepseek-coder")
+    deepseek_api_key: str = ""
+    deepseek_base_url: str = "https://api.deepseek.com/v1"
+    deepseek_model: str = "deepseek-coder"
     deepseek_timeout: float = 120.0
-    deepseek_system_prompt: str | None = Field(default=None)
+    deepseek_system_prompt: Optional[str] = None
+
+    out_dir: str = "out"
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> "Settings":
+        """Build settings from ``env``; keys are matched case-insensitively."""
+        values = {key.upper(): value for key, value in env.items() if key.upper().startswith(ENV_PREFIX)}
+        kwargs = {}
+        for field in fields(cls):
+            raw = values.get(ENV_PREFIX + field.name.upper())
+            if raw is None:
+                continue
+            kwargs[field.name] = _coerce(field.name, raw, field.default)
+        return cls(**kwargs)
+
+
+def _coerce(name: str, raw: str, default: object) -> object:
+    try:
+        if isinstance(default, float):
+            return float(raw)
+        if isinstance(default, int):
+            return int(raw)
+    except ValueError:
+        raise ValueError(f"{ENV_PREFIX}{name.upper()}: expected {type(default).__name__}, got {raw!r}") from None
+    return raw
+
+
+def _parse_env_file(path: str | Path) -> Dict[str, str]:
+    """Read ``KEY=VALUE`` lines from a dotenv file; a missing file is empty."""
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return {}
+    values: Dict[str, str] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[7:].lstrip()
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        elif " #" in value:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key.strip()] = value
+    return values
+
+
+@cache
+def load_settings() -> Settings:
+    return Settings.from_env({**_parse_env_file(ENV_FILE), **os.environ})
 
-    out_dir: str = Field(default="out")
 
-settings = Settings()
+settings = load_settings()
@@ -0,0 +1,124 @@
+"""Bounded LRU map kept in memory and optionally mirrored to SQLite.
+
+Shared storage for the plan and generation caches. Values live decoded in
+memory; the SQLite copy stores them as text via the ``encode``/``decode``
+pair the owner supplies, so later CLI runs can reuse them.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "devopsys"
+
+
+class SQLiteLRUCache(Generic[V]):
+    """Map from string key to ``V`` holding at most ``max_entries`` items.
+
+    ``decode`` returns ``None`` for stored text it cannot use; such rows read
+    as misses. Storage errors never propagate: an unusable cache location must
+    never break the run that consults it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        path: str | Path | None = None,
+        *,
+        encode: Callable[[V], str],
+        decode: Callable[[str], Optional[V]],
+    ) -> None:
+        self.max_entries = max_entries
+        self._encode = encode
+        self._decode = decode
+        self._entries: Dict[str, V] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        if path is not None:
+            self._db = self._open(Path(path))
+
+    @staticmethod
+    def _open(path: Path) -> Optional[sqlite3.Connection]:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            db.commit()
+        except (OSError, sqlite3.Error):
+            return None
+        return db
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[V]:
+        value = self._entries.get(key)
+        if value is None and self._db is not None:
+            value = self._load(key)
+            if value is not None:
+                self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: V) -> None:
+        self._remember(key, value)
+        if self._db is not None:
+            self._store(key, self._encode(value))
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, value: V) -> None:
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order, so the first key is the oldest entry.
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = value
+
+    def _load(self, key: str) -> Optional[V]:
+        with self._lock:
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                return None
+        if row is None:
+            return None
+        return self._decode(row[0])
+
+    def _store(self, key: str, text: str) -> None:
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, created) VALUES (?, ?, ?)",
+                    (key, text, time.time()),
+                )
+                self._db.execute(
+                    "DELETE FROM entries WHERE key NOT IN "
+                    "(SELECT key FROM entries ORDER BY created DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                return
+
+
+__all__ = ["SQLiteLRUCache", "default_cache_dir"]
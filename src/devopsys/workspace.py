@@ -1,61 +1,135 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 IGNORED_NAMES = {".git", ".venv", "__pycache__", ".mypy_cache", ".pytest_cache", "uv.lock"}
 
 
-def _iter_files(root: Path, max_files: int) -> Iterable[Path]:
+def _iter_files(
+    root: Path, max_files: int, visited: Optional[List[Path]] = None
+) -> Iterable[Tuple[Path, Optional[os.stat_result]]]:
+    """Yield ``(path, stat)`` for the first files of a depth-first walk.
+
+    ``os.scandir`` entries cache their type and stat, so each file costs one
+    ``stat`` call and callers reuse it instead of statting again.
+    """
     stack: List[Path] = [root]
     collected = 0
     while stack and collected < max_files:
         current = stack.pop()
+        if visited is not None:
+            visited.append(current)
         try:
-            entries = sorted(current.iterdir(), key=lambda p: (p.is_file(), p.name))
-        except (FileNotFoundError, PermissionError):
+            with os.scandir(current) as it:
+                entries = sorted((e for e in it if e.name not in IGNORED_NAMES), key=lambda e: (e.is_file(), e.name))
+        except (FileNotFoundError, PermissionError, NotADirectoryError):
             continue
         for entry in entries:
-            if entry.name in IGNORED_NAMES:
-                continue
             if entry.is_dir():
-                stack.append(entry)
+                stack.append(Path(entry.path))
             elif entry.is_file():
-                yield entry
+                try:
+                    st: Optional[os.stat_result] = entry.stat()
+                except OSError:
+                    st = None
+                yield Path(entry.path), st
                 collected += 1
                 if collected >= max_files:
                     break
 
 
 MAX_SNAPSHOT_CHARS = 4_000
+_READ_WORKERS = 8
+
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+# (root, max_files, max_bytes) -> (signature of the inputs, snapshot text)
+_SNAPSHOT_CACHE: Dict[Tuple[Path, int, int], Tuple[Signature, str]] = {}
+
+
+def _signature_entry(path: Path, st: Optional[os.stat_result]) -> Tuple[str, int, int]:
+    if st is None:
+        return (str(path), -1, -1)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _stat_signature(paths: Sequence[Path]) -> Signature:
+    signature = []
+    for path in paths:
+        try:
+            st: Optional[os.stat_result] = path.stat()
+        except OSError:
+            st = None
+        signature.append(_signature_entry(path, st))
+    return tuple(signature)
+
+
+def _read_excerpt(path: Path, max_chars: int) -> Optional[str]:
+    """Return the first ``max_chars`` characters of a text file.
+
+    Only the head is read (a UTF-8 character is at most four bytes), so large
+    logs or artefacts cost the same as small files. Unreadable, empty and
+    binary-looking files (a NUL byte near the start) give ``None``.
+    """
+    try:
+        with path.open("rb") as handle:
+            raw = handle.read(max_chars * 4)
+    except OSError:
+        return None
+    if not raw or b"\x00" in raw[:512]:
+        return None
+    return raw.decode("utf-8", errors="ignore")[:max_chars].rstrip()
+
+
+def _read_excerpts(files: Sequence[Path], max_chars: int) -> List[Optional[str]]:
+    """``_read_excerpt`` for every file, overlapping the reads when cold.
+
+    The snapshot is built once at the start of a run, usually with nothing in
+    the page cache yet, so the opens and reads are issued from a few threads.
+    """
+    if len(files) < 2:
+        return [_read_excerpt(path, max_chars) for path in files]
+    with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(files)), thread_name_prefix="devopsys-snapshot") as pool:
+        return list(pool.map(lambda path: _read_excerpt(path, max_chars), files))
 
 
 def build_workspace_snapshot(root: Path | None = None, max_files: int = 6, max_bytes: int = 600) -> str:
+    """Describe the first few files under ``root`` for the agents' prompts.
+
+    The result only depends on the listings of the directories the walk
+    visited and on the files it picked. Their mtimes and sizes are recorded,
+    and an unchanged workspace is served from memory without re-reading.
+    """
     root = (root or Path.cwd()).resolve()
-    files = list(_iter_files(root, max_files))
+    key = (root, max_files, max_bytes)
+    cached = _SNAPSHOT_CACHE.get(key)
+    if cached is not None:
+        signature, snapshot = cached
+        if _stat_signature([Path(entry[0]) for entry in signature]) == signature:
+            return snapshot
+
+    visited: List[Path] = []
+    entries = list(_iter_files(root, max_files, visited))
+    files = [path for path, _ in entries]
+    rels = [path.relative_to(root) for path in files]
+    signature = _stat_signature(visited) + tuple(_signature_entry(path, st) for path, st in entries)
 
     lines: List[str] = [f"Workspace root: {root}", "Files observed:"]
     if not files:
         lines.append("- (no files detected)")
-    for path in files:
-        try:
-            size = path.stat().st_size
-        except (FileNotFoundError, PermissionError):
-            size = -1
-        rel = path.relative_to(root)
+    for rel, (_, st) in zip(rels, entries):
+        size = st.st_size if st is not None else -1
         size_info = f"{size} bytes" if size >= 0 else "size unavailable"
         lines.append(f"- {rel} ({size_info})")
 
     lines.append("\nFile excerpts (truncated):")
-    for path in files:
-        try:
-            text = path.read_text(encoding="utf-8", errors="ignore")
-        except (FileNotFoundError, PermissionError, OSError):
-            continue
-        if not text:
+    for rel, excerpt in zip(rels, _read_excerpts(files, max_bytes)):
+        if excerpt is None:
             continue
-        excerpt = text[:max_bytes].rstrip()
-        rel = path.relative_to(root)
         lines.append(f"--- {rel} ---")
         lines.append(excerpt)
 
@@ -63,4 +137,5 @@ def build_workspace_snapshot(root: Path | None = None, max_files: int = 6, max_b
     if len(snapshot) > MAX_SNAPSHOT_CHARS:
         snapshot = snapshot[:MAX_SNAPSHOT_CHARS].rstrip()
         snapshot += "\n[workspace snapshot truncated]"
+    _SNAPSHOT_CACHE[key] = (signature, snapshot)
     return snapshot
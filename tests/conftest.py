@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Run against the checkout's sources even when the package is not installed.
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
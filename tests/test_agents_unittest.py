@@ -1,6 +1,4 @@
 
-import sys, pathlib
-sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
 import unittest
 from devopsys.models.dummy import DummyModel
 from devopsys.agents.docker import DockerAgent
@@ -1,9 +1,5 @@
-import pathlib
-import sys
 import unittest
 
-sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
-
 from devopsys.agents.bash_utils import normalise_bash_output
 
 
@@ -80,6 +80,10 @@ class _DummyListResponse:
     def json(self):
         return self.payload
 
+    @property
+    def content(self):
+        return json.dumps(self.payload).encode("utf-8")
+
 
 class _DummyListClient:
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from devopsys import jsonutil
+from devopsys.langchain_support import complete_json_object
+from devopsys.models.base import HTTPModel, Model, run_sync
+from devopsys.models.ollama import OllamaModel
+from devopsys.models.openai import OpenAIModel
+
+
+def _bind_transport(model, handler):
+    model._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    model._client_loop = asyncio.get_running_loop()
+
+
+def test_ollama_streams_and_joins_chunks():
+    seen = {}
+
+    def handler(request):
+        seen["payload"] = json.loads(request.content)
+        lines = [{"response": "he"}, {"response": "llo"}, {"response": "", "done": True}, {"response": "!"}]
+        return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+    model = OllamaModel("http://ollama.test", "llama3")
+
+    async def scenario():
+        _bind_transport(model, handler)
+        pieces = [piece async for piece in model.astream("hi")]
+        await model.aclose()
+        return pieces
+
+    assert asyncio.run(scenario()) == ["he", "llo"]
+    assert seen["payload"]["stream"] is True
+
+
+def test_ollama_stream_error_line_raises():
+    def handler(request):
+        lines = [{"response": "he"}, {"error": "model ran out of memory"}]
+        return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+    model = OllamaModel("http://ollama.test", "llama3")
+
+    async def scenario():
+        _bind_transport(model, handler)
+        try:
+            return [piece async for piece in model.astream("hi")]
+        finally:
+            await model.aclose()
+
+    with pytest.raises(RuntimeError, match="ran out of memory"):
+        asyncio.run(scenario())
+
+
+class _LoopRecordingModel(Model):
+    def __init__(self):
+        self.loops = []
+
+    async def acomplete(self, prompt: str) -> str:
+        self.loops.append(asyncio.get_running_loop())
+        return prompt.upper()
+
+
+def test_complete_reuses_one_event_loop():
+    model = _LoopRecordingModel()
+
+    assert model.complete("a") == "A"
+    assert model.complete("b") == "B"
+    assert model.loops[0] is model.loops[1]
+    assert not model.loops[0].is_closed()
+
+
+class _PooledModel(HTTPModel):
+    async def acomplete(self, prompt: str) -> str:
+        return prompt
+
+
+async def _client_of(model: HTTPModel) -> httpx.AsyncClient:
+    return model._get_client()
+
+
+def test_http_client_from_another_loop_is_closed_on_that_loop():
+    model = _PooledModel()
+    background_client = run_sync(_client_of(model))
+
+    local_client = asyncio.run(_client_of(model))
+    # The stale client is closed by a task on the background loop.
+    for _ in range(100):
+        if background_client.is_closed:
+            break
+        run_sync(asyncio.sleep(0.01))
+
+    assert local_client is not background_client
+    assert background_client.is_closed
+
+
+class _ReentrantModel(Model):
+    async def acomplete(self, prompt: str) -> str:
+        # Synchronous code reached from the loop thread must fail, not deadlock.
+        return self.complete(prompt) if prompt == "nested" else prompt
+
+
+def test_run_sync_refuses_the_loop_thread():
+    with pytest.raises(RuntimeError, match="model event loop thread"):
+        _ReentrantModel().complete("nested")
+
+
+class _ChattyModel(Model):
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.sent = 0
+
+    async def acomplete(self, prompt: str) -> str:
+        return "".join(self.pieces)
+
+    async def astream(self, prompt: str):
+        for piece in self.pieces:
+            self.sent += 1
+            yield piece
+
+
+def test_complete_json_object_stops_after_first_object():
+    model = _ChattyModel(['Sure: {"plan": [', '{"reason": "a } in \\"text\\""}', "]} and then", " more prose"])
+
+    raw = complete_json_object(model, "plan it")
+
+    assert model.sent == 3
+    assert raw.startswith('Sure: {"plan"')
+    assert "more prose" not in raw
+
+
+def test_first_object_skips_braces_inside_strings_and_trailing_objects():
+    text = 'Verdict: {"ok": false, "reason": "missing }"} then {"noise": 1}'
+
+    assert jsonutil.first_object(text) == '{"ok": false, "reason": "missing }"}'
+    assert jsonutil.first_object('{"open": [') is None
+    assert jsonutil.first_object("no json here") is None
+
+
+def test_openai_batches_candidates_and_tops_up_missing_choices():
+    requested = []
+
+    def handler(request):
+        payload = json.loads(request.content)
+        requested.append(payload.get("n", 1))
+        # Behave like a server that ignores ``n`` and returns one choice.
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"answer {len(requested)}"}}]})
+
+    model = OpenAIModel(None, "gpt-test", base_url="http://openai.test/v1")
+
+    async def scenario():
+        _bind_transport(model, handler)
+        answers = await model.acomplete_many("hi", 3)
+        await model.aclose()
+        return answers
+
+    answers = asyncio.run(scenario())
+
+    assert len(answers) == 3
+    assert requested[0] == 3
+    assert requested[1:] == [1, 1]
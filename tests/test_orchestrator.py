@@ -1,5 +1,22 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from dataclasses import asdict
+
+import pytest
+
+from devopsys.models.base import Model, ModelError
 from devopsys.models.dummy import DummyModel
+from devopsys import orchestrator as orchestrator_module
 from devopsys.orchestrator import MultiAgentOrchestrator, LeadAgent, PlanStep
+from devopsys.agents.base import AgentResult
+from devopsys.agents.python import PythonAgent
+from devopsys.generation_cache import GenerationCache, generation_cache_key, is_deterministic, model_identity
+from devopsys.plan_cache import PlanCache
+from devopsys.run_logger import NullRunLogger
+from devopsys.workspace import build_workspace_snapshot
 
 
 def _dummy_factory():
@@ -18,7 +35,7 @@ def test_orchestrator_chooses_docker_for_dockerfile():
 def test_orchestrator_prefers_first_file_step(monkeypatch):
     orchestrator = MultiAgentOrchestrator(_dummy_factory)
 
-    def fake_plan(self, task, workspace):
+    def fake_plan(self, task, workspace, route=None):
         return [
             PlanStep(agent="docker", instruction=task, reason="primary docker"),
             PlanStep(agent="python", instruction="setup script", reason="helper"),
@@ -35,7 +52,7 @@ def test_orchestrator_prefers_first_file_step(monkeypatch):
 def test_orchestrator_reorders_to_router_agent(monkeypatch):
     orchestrator = MultiAgentOrchestrator(_dummy_factory)
 
-    def fake_plan(self, task, workspace):
+    def fake_plan(self, task, workspace, route=None):
         return [
             PlanStep(agent="python", instruction="write helper", reason="prep"),
             PlanStep(agent="docker", instruction=task, reason="actual dockerfile"),
@@ -47,3 +64,349 @@ def test_orchestrator_reorders_to_router_agent(monkeypatch):
 
     assert result.steps[0].step.agent == "docker"
     assert result.final.filename == "Dockerfile"
+
+
+class _PlanModel(Model):
+    def __init__(self):
+        self.calls = 0
+
+    async def acomplete(self, prompt: str) -> str:
+        self.calls += 1
+        return '{"plan": [{"agent": "docker", "instruction": "build it", "reason": "planned"}]}'
+
+
+def test_lead_agent_serves_repeated_task_from_plan_cache():
+    model = _PlanModel()
+    cache = PlanCache()
+    planner = LeadAgent(model, cache=cache)
+
+    first = planner.plan("Собери Dockerfile", "ws")
+    cache.put("Собери Dockerfile", "ws", [asdict(step) for step in first], model_identity(model))
+    second = planner.plan("  собери   dockerfile ", "ws")
+
+    assert model.calls == 1
+    assert second == first
+    planner.plan("Собери Dockerfile", "other workspace")
+    assert model.calls == 2
+
+    other_model = _PlanModel()
+    other_model.model = "another-model"
+    LeadAgent(other_model, cache=cache).plan("Собери Dockerfile", "ws")
+    assert other_model.calls == 1
+
+
+class _BarrierAgent:
+    def __init__(self, name, barrier):
+        self.name = name
+        self.barrier = barrier
+
+    def run(self, task, plan_context="", workspace=""):
+        # Only returns once every job is running at the same time.
+        self.barrier.wait()
+        return f"{self.name}:{task}"
+
+
+class _StartRecorder(NullRunLogger):
+    def __init__(self):
+        self.started = []
+
+    def on_agent_start(self, step, instruction, context):
+        self.started.append(step.reason)
+
+
+def test_independent_steps_run_concurrently_in_plan_order():
+    logger = _StartRecorder()
+    orchestrator = MultiAgentOrchestrator(_dummy_factory, logger=logger)
+    barrier = threading.Barrier(3, timeout=5)
+    jobs = [
+        (PlanStep(agent="bash", instruction=name, reason=name), _BarrierAgent(name, barrier), task, name)
+        for name, task in (("a", "one"), ("b", "two"), ("c", "three"))
+    ]
+
+    futures = orchestrator._start_agent_runs(jobs, "ws")
+    results = [future.result() for future in futures]
+
+    assert results == ["a:one", "b:two", "c:three"]
+    # Every start was logged by its worker before the barrier released them.
+    assert sorted(logger.started) == ["a", "b", "c"]
+
+
+def test_models_are_built_once_per_factory(monkeypatch):
+    built = []
+
+    def factory():
+        built.append(1)
+        return DummyModel()
+
+    def fake_plan(self, task, workspace, route=None):
+        return [
+            PlanStep(agent="docker", instruction=task, reason="image"),
+            PlanStep(agent="bash", instruction="entrypoint", reason="helper"),
+        ]
+
+    monkeypatch.setattr(LeadAgent, "plan", fake_plan, raising=False)
+    orchestrator = MultiAgentOrchestrator(factory)
+    orchestrator.execute("Собери Dockerfile под Python 3.11 c poetry")
+    orchestrator.close()
+
+    assert len(built) == 1
+
+
+def test_persistent_plan_cache_survives_reopen(tmp_path):
+    path = tmp_path / "plans.sqlite"
+    plan = [{"agent": "docker", "instruction": "build", "reason": "cached"}]
+
+    first = PlanCache(path=path)
+    first.put("Build image", "ws", plan)
+    first.close()
+
+    reopened = PlanCache(path=path)
+    assert reopened.get("build   IMAGE", "ws") == plan
+    assert reopened.get("build image", "other") is None
+    reopened.close()
+
+
+def test_generation_cache_keys_on_model_and_survives_reopen(tmp_path):
+    greedy, sampled = _PlanModel(), _PlanModel()
+    greedy.temperature, sampled.temperature = 0, 0.2
+    key = generation_cache_key("python", greedy, "print hi", "ws")
+
+    first = GenerationCache(path=tmp_path / "gen.sqlite")
+    first.put(key, AgentResult(text="print('hi')\n", filename="script.py"))
+    first.close()
+
+    reopened = GenerationCache(path=tmp_path / "gen.sqlite")
+    assert reopened.get(key) == AgentResult(text="print('hi')\n", filename="script.py")
+    assert reopened.get(generation_cache_key("python", greedy, "print hi", "other")) is None
+    reopened.close()
+    assert is_deterministic(greedy) and not is_deterministic(sampled)
+
+
+def test_parse_plan_accepts_fenced_and_loose_json():
+    fenced = '```json\n{"plan": [{"agent": "docker", "instruction": "build", "reason": "r"}]}\n```'
+    loose = 'Plan:\n{"plan": [{"agent": "bash", "instruction": "line one\nline two", "reason": "r"}]}\nDone.'
+
+    assert [step.agent for step in LeadAgent._parse_plan(fenced)] == ["docker"]
+    assert LeadAgent._parse_plan(loose)[0].instruction == "line one\nline two"
+    assert LeadAgent._parse_plan("no json here") == []
+
+
+def test_verifier_payload_keeps_the_first_object_of_a_brace_wrapped_reply():
+    parse = MultiAgentOrchestrator._parse_verifier_payload
+
+    assert parse('{"ok": false, "reason": "r"}\n{"noise": 1}') == {"ok": False, "reason": "r"}
+    assert parse('{"ok": true}\nNote: use {braces}') == {"ok": True}
+
+
+class _StuckModel(Model):
+    def __init__(self):
+        self.prompts = []
+
+    async def acomplete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return "def main(:\n    pass\n"
+
+
+def test_refinement_stops_when_the_model_repeats_itself():
+    model = _StuckModel()
+    orchestrator = MultiAgentOrchestrator(lambda: model)
+    step = PlanStep(agent="python", instruction="print hi", reason="r")
+    original = PythonAgent(model).run(task="print hi")
+    attempts = orchestrator._review_and_refine_python(
+        original_step=step, last_result=original, task="print hi", workspace=""
+    )
+
+    # The first refinement differs from the original (the placeholder echoes the
+    # instruction); the second repeats the first, which ends the loop.
+    refinements = [item for item in attempts if item.step.reason.startswith("refinement attempt")]
+    assert len(refinements) == 2
+
+
+class _CountingVerdictModel(Model):
+    def __init__(self):
+        self.calls = 0
+
+    async def acomplete(self, prompt: str) -> str:
+        self.calls += 1
+        return '{"ok": false, "reason": "r", "missing": []}'
+
+
+@pytest.mark.parametrize("script", ["# Generated (dummy backend)\ndef main(:\n", None], ids=["plateau", "exhausted"])
+def test_refinement_ends_with_the_static_verdict_for_unparsable_code(script):
+    verifier_model = _CountingVerdictModel()
+    counter = itertools.count()
+
+    class _BrokenModel(Model):
+        async def acomplete(self, prompt: str) -> str:
+            # The dummy marker makes the normaliser keep the broken script.
+            return script or f"# Generated (dummy backend) {next(counter)}\ndef main(:\n"
+
+    broken = _BrokenModel()
+    orchestrator = MultiAgentOrchestrator(
+        _StuckModel,
+        agent_model_factories={"python": lambda: broken, "verifier": lambda: verifier_model},
+    )
+    step = PlanStep(agent="python", instruction="print hi", reason="r")
+    attempts = orchestrator._review_and_refine_python(
+        original_step=step,
+        last_result=AgentResult(text="def main(:\n"),
+        task="print hi",
+        workspace="",
+        max_attempts=2,
+    )
+
+    # A plateau reuses the verdict on the repeated script; running out of
+    # attempts audits the last one. Neither asks the LLM verifier.
+    verdicts = [item.step.reason for item in attempts if item.step.agent == "verifier"]
+    assert verdicts == ["static syntax audit"] * (2 if script else 3)
+    assert verifier_model.calls == 0
+
+
+class _HangingModel(Model):
+    async def acomplete(self, prompt: str) -> str:
+        await asyncio.sleep(5)
+        return '{"plan": []}'
+
+
+def test_lead_agent_falls_back_when_the_planner_times_out():
+    planner = LeadAgent(_HangingModel(), timeout=0.05)
+
+    started = time.monotonic()
+    steps = planner.plan("Собери Dockerfile", "ws")
+
+    assert time.monotonic() - started < 1
+    assert [step.agent for step in steps] == ["docker"]
+
+
+class _FailingModel(Model):
+    async def acomplete(self, prompt: str) -> str:
+        raise ModelError("Ollama error: model requires more system memory")
+
+
+def test_lead_agent_warns_and_falls_back_when_the_planner_fails(caplog):
+    planner = LeadAgent(_FailingModel())
+
+    with caplog.at_level(logging.WARNING, logger="devopsys.orchestrator"):
+        steps = planner.plan("Собери Dockerfile", "ws")
+
+    assert [step.agent for step in steps] == ["docker"]
+    assert not planner.planned_by_model
+    assert "keyword router" in caplog.text
+
+
+def test_failed_planner_reuses_the_route_of_the_run(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    classify = orchestrator_module.classify_route
+
+    def counting_classify(task):
+        calls.append(task)
+        return classify(task)
+
+    monkeypatch.setattr(orchestrator_module, "classify_route", counting_classify)
+    orchestrator = MultiAgentOrchestrator(
+        _dummy_factory,
+        planner_model_factory=_FailingModel,
+        agent_model_factories={"verifier": _dummy_factory},
+    )
+    result = orchestrator.execute("Собери Dockerfile")
+
+    assert result.steps[0].step.agent == "docker"
+    assert calls == ["Собери Dockerfile"]
+
+
+class _FlakyPlanModel(_PlanModel):
+    def __init__(self):
+        super().__init__()
+        self.hang = True
+
+    async def acomplete(self, prompt: str) -> str:
+        if self.hang:
+            self.hang = False
+            await asyncio.sleep(5)
+        return await super().acomplete(prompt)
+
+
+def test_fallback_plan_after_a_timeout_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    planner_model = _FlakyPlanModel()
+    orchestrator = MultiAgentOrchestrator(
+        _dummy_factory,
+        planner_model_factory=lambda: planner_model,
+        agent_model_factories={"verifier": _dummy_factory},
+        plan_cache_path=tmp_path / "plans.sqlite",
+        plan_timeout=0.05,
+    )
+    for _ in range(3):
+        orchestrator.execute("Собери Dockerfile")
+    orchestrator.close()
+
+    # The timed-out run used the router's plan; the next run asks the planner
+    # again and only its answer is served from the cache afterwards.
+    assert planner_model.calls == 1
+
+
+class _VerifyingPlanModel(_PlanModel):
+    async def acomplete(self, prompt: str) -> str:
+        self.calls += 1
+        return (
+            '{"plan": [{"agent": "verifier", "instruction": "check", "reason": "review"},'
+            ' {"agent": "docker", "instruction": "build it", "reason": "planned"}]}'
+        )
+
+
+def test_plan_cache_stores_the_planner_answer_before_pruning(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    planner_model = _VerifyingPlanModel()
+    orchestrator = MultiAgentOrchestrator(
+        _dummy_factory,
+        planner_model_factory=lambda: planner_model,
+        agent_model_factories={"verifier": _dummy_factory},
+        plan_cache_enabled=True,
+    )
+    orchestrator.execute("Собери Dockerfile")
+
+    # Pruning drops the planner's verifier step for the run, not in the cache.
+    cached = orchestrator.plan_cache.get("Собери Dockerfile", build_workspace_snapshot(), model_identity(planner_model))
+    assert [item["agent"] for item in cached] == ["verifier", "docker"]
+
+
+def test_malformed_plan_cache_entry_is_a_miss():
+    model = _PlanModel()
+    cache = PlanCache()
+    cache.put("Собери Dockerfile", "ws", [{"agent": "docker", "instruction": "x"}], model_identity(model))
+
+    steps = LeadAgent(model, cache=cache).plan("Собери Dockerfile", "ws")
+
+    assert model.calls == 1
+    assert [step.reason for step in steps] == ["planned"]
+
+
+class _RecordingAgent:
+    def __init__(self, name, calls, fail=False):
+        self.name = name
+        self.calls = calls
+        self.fail = fail
+
+    def run(self, task, plan_context="", workspace=""):
+        self.calls.append(self.name)
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return self.name
+
+
+def test_sequential_steps_run_only_when_their_result_is_requested():
+    calls = []
+    orchestrator = MultiAgentOrchestrator(_dummy_factory, max_parallel_steps=1)
+    step = PlanStep(agent="bash", instruction="one", reason="r")
+    jobs = [(step, _RecordingAgent("a", calls, fail=True), "one", ""), (step, _RecordingAgent("b", calls), "two", "")]
+
+    futures = orchestrator._start_agent_runs(jobs, "ws")
+    assert calls == []
+
+    with pytest.raises(RuntimeError):
+        futures[0].result()
+    for future in futures:
+        future.cancel()
+
+    assert calls == ["a"]
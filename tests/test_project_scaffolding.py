@@ -8,6 +8,7 @@ import pytest
 
 from devopsys.models.base import Model
 from devopsys.orchestrator import MultiAgentOrchestrator
+from devopsys.project_builder import ProjectSpec
 
 
 class CallableModel(Model):
@@ -64,7 +65,8 @@ def project_plan() -> str:
 
 @pytest.fixture
 def architect_factory(project_plan):
-    return lambda: CallableModel(lambda _prompt: project_plan)
+    model = CallableModel(lambda _prompt: project_plan)
+    return lambda: model
 
 
 def _python_handler(prompt: str) -> str:
@@ -81,7 +83,8 @@ def _python_handler(prompt: str) -> str:
 
 @pytest.fixture
 def python_factory():
-    return lambda: CallableModel(_python_handler)
+    model = CallableModel(_python_handler)
+    return lambda: model
 
 
 def _universal_handler(prompt: str) -> str:
@@ -98,18 +101,20 @@ def _universal_handler(prompt: str) -> str:
 
 @pytest.fixture
 def universal_factory():
-    return lambda: CallableModel(_universal_handler)
+    model = CallableModel(_universal_handler)
+    return lambda: model
 
 
 @pytest.fixture
 def verifier_factory():
-    return lambda: CallableModel(lambda _prompt: json.dumps({
+    model = CallableModel(lambda _prompt: json.dumps({
         "ok": True,
         "reason": "syntactic checks passed",
         "missing": [],
         "forbidden": [],
         "suggested_prompt": "",
     }))
+    return lambda: model
 
 
 @pytest.fixture
@@ -175,3 +180,68 @@ def test_project_scaffold_uses_custom_root(tmp_path, monkeypatch, orchestrator):
     assert project_dir.exists() and project_dir.is_dir()
     assert "Project scaffold created at sample-app" in result.final.text
     assert not (tmp_path / "sample-app").exists()
+
+
+def test_project_spec_layers_follow_declared_dependencies():
+    spec = ProjectSpec.from_json(
+        json.dumps(
+            {
+                "project_name": "layered",
+                "files": [
+                    {"path": "README.md", "depends_on": ["src/app/cli.py"]},
+                    {"path": "src/app/__init__.py", "depends_on": []},
+                    {"path": "src/app/cli.py", "depends_on": ["src/app/__init__.py", "missing.py"]},
+                    {"path": "pyproject.toml", "depends_on": []},
+                ],
+            }
+        )
+    )
+
+    layers = [[item.normalized_path for item in layer] for layer in spec.layers()]
+
+    assert layers == [
+        ["src/app/__init__.py", "pyproject.toml"],
+        ["src/app/cli.py"],
+        ["README.md"],
+    ]
+
+
+def test_project_spec_without_declared_dependencies_stays_sequential():
+    spec = ProjectSpec.from_json(
+        json.dumps({"project_name": "plain", "files": [{"path": "a.py"}, {"path": "b.py"}, {"path": "c.py", "depends_on": []}]})
+    )
+
+    layers = [[item.normalized_path for item in layer] for layer in spec.layers()]
+
+    assert layers == [["a.py", "c.py"], ["b.py"]]
+
+
+@pytest.mark.parametrize("max_parallel_steps", [1, 4])
+def test_project_files_see_earlier_files_without_declared_dependencies(
+    tmp_path, monkeypatch, architect_factory, universal_factory, verifier_factory, max_parallel_steps
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("devopsys.orchestrator.shutil.which", lambda name: None)
+    monkeypatch.setattr("devopsys.agents.verifier.shutil.which", lambda name: None)
+    prompts = []
+
+    def recording_handler(prompt):
+        prompts.append(prompt)
+        return _python_handler(prompt)
+
+    python_model = CallableModel(recording_handler)
+    orchestrator = MultiAgentOrchestrator(
+        lambda: CallableModel(lambda prompt: prompt),
+        agent_model_factories={
+            "project_architect": architect_factory,
+            "python": lambda: python_model,
+            "universal": universal_factory,
+            "verifier": verifier_factory,
+        },
+        max_parallel_steps=max_parallel_steps,
+    )
+    orchestrator.execute("Bootstrap a sample python project")
+
+    cli_prompt = next(prompt for prompt in prompts if "Create the file 'src/sample_app/cli.py'" in prompt)
+    for earlier in ("README.md", "pyproject.toml", "src/sample_app/__init__.py"):
+        assert f"- {earlier}" in cli_prompt
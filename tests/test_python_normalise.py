@@ -5,9 +5,7 @@ import ast
 from devopsys.agents.python_utils import normalise_python_output
 
 
-def test_normaliser_strips_markdown_and_prose():
-    raw = (
-        """```python
+_RAW_MARKDOWN_SAMPLE = """```python
 from __future__ import annotations
 
 import argparse
@@ -36,9 +34,10 @@ if __name__ == "__main__":
 
 This script provides a basic structure... and more prose here.
 """
-    )
 
-    code = normalise_python_output(raw, task="test task")
+
+def test_normaliser_strips_markdown_and_prose():
+    code = normalise_python_output(_RAW_MARKDOWN_SAMPLE, task="test task")
     assert "```" not in code
     assert "This script provides" not in code
     # must contain structure
@@ -1,14 +1,24 @@
-import pathlib
-import sys
 import unittest
 
-sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
-
-from devopsys.agents.python_utils import normalise_python_output
+from devopsys.agents.python_utils import (
+    _normalise_python_output_cached,
+    clear_normaliser_cache,
+    normalise_python_output,
+)
 
 
 SAMPLE_INVALID_PY_OUTPUT = """The provided code is a Python project."""
 
+SAMPLE_VALID_PY_OUTPUT = """
+def main():
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
+"""
+EXPECTED_VALID_PY_OUTPUT = SAMPLE_VALID_PY_OUTPUT.strip()
+
 
 class PythonUtilsTestCase(unittest.TestCase):
     def test_invalid_code_returns_placeholder_even_for_specific_tasks(self):
@@ -24,16 +34,14 @@ class PythonUtilsTestCase(unittest.TestCase):
         self.assertIn(task, code)
 
     def test_valid_code_preserved(self):
-        snippet = """
-def main():
-    print("ok")
-
-
-if __name__ == "__main__":
-    main()
-"""
-        code = normalise_python_output(snippet, "any")
-        self.assertEqual(code.strip(), snippet.strip())
+        code = normalise_python_output(SAMPLE_VALID_PY_OUTPUT, "any")
+        self.assertEqual(code.strip(), EXPECTED_VALID_PY_OUTPUT)
+
+    def test_clear_normaliser_cache_drops_memoised_results(self):
+        normalise_python_output(SAMPLE_VALID_PY_OUTPUT, "any")
+        self.assertGreater(_normalise_python_output_cached.cache_info().currsize, 0)
+        clear_normaliser_cache()
+        self.assertEqual(_normalise_python_output_cached.cache_info().currsize, 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+
+from devopsys.settings import Settings, _parse_env_file
+
+
+def test_env_file_values_are_coerced_and_overridden_by_environment(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "# comment\n"
+        "DEVOPSYS_BACKEND=ollama\n"
+        "export DEVOPSYS_MAX_TOKENS=512\n"
+        'DEVOPSYS_OPENAI_SYSTEM_PROMPT="be brief"\n'
+        "DEVOPSYS_TEMPERATURE=0.5\n",
+        encoding="utf-8",
+    )
+
+    env = {**_parse_env_file(env_file), "devopsys_temperature": "0"}
+    settings = Settings.from_env(env)
+
+    assert settings.backend == "ollama"
+    assert settings.max_tokens == 512
+    assert settings.temperature == 0.0
+    assert settings.openai_system_prompt == "be brief"
+    assert settings.deepseek_system_prompt is None
+    assert settings.plan_timeout == 0.0
+
+
+def test_invalid_number_names_the_variable():
+    with pytest.raises(ValueError, match="DEVOPSYS_PLAN_TIMEOUT"):
+        Settings.from_env({"DEVOPSYS_PLAN_TIMEOUT": "soon"})
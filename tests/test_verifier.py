@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from devopsys.agents.verifier import CHILD_CPU_SECONDS, CHILD_FILE_SIZE_LIMIT, VerifierAgent, _run_isolated
+from devopsys.models.dummy import DummyModel
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process groups are POSIX-only")
+def test_run_isolated_kills_forked_children_on_timeout():
+    started = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        _run_isolated(["bash", "-c", "sleep 30 & sleep 30"], timeout=1)
+    # The backgrounded child holds the pipes open; without killing the whole
+    # group communicate() would block until it exits.
+    assert time.monotonic() - started < 10
+
+
+def test_run_isolated_returns_completed_process():
+    completed = _run_isolated([sys.executable, "-c", "print('ok')"], timeout=10)
+    assert completed.returncode == 0
+    assert completed.stdout.strip() == "ok"
+
+
+def test_python_runtime_skipped_when_task_needs_no_output():
+    verifier = VerifierAgent(DummyModel())
+    report = verifier._execute_python("x = 1\n", "auto", None, task="Define a constant")
+    assert report.compilation_ok is True
+    assert report.returncode is None
+    assert report.runtime_skipped is True
+    assert report.invocation is None
+    analysis = verifier._format_analysis(report, None)
+    assert "runtime=skipped" in analysis and "exit_code" not in analysis
+    outcome = verifier._build_outcome('{"ok": true, "reason": "fine"}', report, "Define a constant")
+    assert outcome["ok"] is True
+
+
+def test_python_runtime_executed_when_task_inspects_output():
+    verifier = VerifierAgent(DummyModel())
+    report = verifier._execute_python("print('hi')\n", "auto", None, task="Print a greeting")
+    assert report.returncode == 0
+    assert report.stdout == "hi"
+    assert report.invocation is not None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="resource limits are POSIX-only")
+def test_run_isolated_applies_cpu_limit():
+    completed = _run_isolated(
+        [sys.executable, "-c", "import resource; print(resource.getrlimit(resource.RLIMIT_CPU)[0])"],
+        timeout=10,
+    )
+    assert completed.stdout.strip() == str(CHILD_CPU_SECONDS)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="resource limits are POSIX-only")
+def test_run_isolated_stops_writes_past_the_file_size_limit(tmp_path):
+    target = tmp_path / "big.bin"
+    script = f"open({str(target)!r}, 'wb').write(b'x' * {2 * CHILD_FILE_SIZE_LIMIT})"
+    completed = _run_isolated([sys.executable, "-c", script], timeout=10)
+
+    assert completed.returncode != 0
+    assert target.stat().st_size <= CHILD_FILE_SIZE_LIMIT
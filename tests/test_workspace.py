@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from devopsys.workspace import build_workspace_snapshot
+
+
+def test_snapshot_is_reused_until_the_workspace_changes(tmp_path):
+    (tmp_path / "app.py").write_text("print('one')\n", encoding="utf-8")
+
+    first = build_workspace_snapshot(tmp_path)
+    assert build_workspace_snapshot(tmp_path) is first
+
+    (tmp_path / "app.py").write_text("print('changed')\n", encoding="utf-8")
+    changed = build_workspace_snapshot(tmp_path)
+    assert "changed" in changed
+
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("VALUE = 1\n", encoding="utf-8")
+    assert "pkg/mod.py" in build_workspace_snapshot(tmp_path)
+
+
+def test_snapshot_excerpts_skip_binary_files_and_read_only_the_head(tmp_path):
+    (tmp_path / "blob.bin").write_bytes(b"\x00\x01binary")
+    (tmp_path / "big.log").write_text("x" * 10_000 + "TAIL", encoding="utf-8")
+
+    snapshot = build_workspace_snapshot(tmp_path, max_bytes=50)
+
+    assert "--- blob.bin ---" not in snapshot
+    assert "--- big.log ---\n" + "x" * 50 in snapshot
+    assert "TAIL" not in snapshot